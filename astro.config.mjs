@@ -4,12 +4,19 @@ import { defineConfig } from 'astro/config';
 import tailwind from '@astrojs/tailwind';
 
 import sitemap from '@astrojs/sitemap';
+import { readFileSync } from 'node:fs';
+
+// Enlaces /noticias/<n> de antes de los ids estables -> /noticias/<id> (scripts/news_shards.py)
+const legacyIds = JSON.parse(readFileSync(new URL('./src/data/cms/legacy_ids.json', import.meta.url), 'utf-8'));
 
 // https://astro.build/config
 export default defineConfig({
   site: 'https://www.cmsconsultores.cl',
   integrations: [tailwind(), sitemap()],
   output: 'static',
+  redirects: Object.fromEntries(
+    Object.entries(legacyIds).map(([legacyId, id]) => [`/noticias/${legacyId}`, `/noticias/${id}`])
+  ),
   build: {
     format: 'directory'
   },
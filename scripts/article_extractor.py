@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Extracción del contenido completo de artículos (etapa de detalle)
+Descarga las páginas en paralelo con un tope de conexiones por dominio, de modo
+que un sitio lento no bloquee al resto, y aplica CSS_SELECTORS de la configuración
+"""
+
+import logging
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from config_iso_scraper import CONFIG, CSS_SELECTORS
+from date_normalizer import normalize_date, to_display
+from http_client import HttpClient
+from rate_limiter import normalize_host
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Largo mínimo para aceptar un bloque como cuerpo del artículo
+MIN_CONTENT_LENGTH = 200
+
+
+def failed_copy(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Copia del artículo marcada con scraping_success=False (dict simple si no se puede copiar)"""
+    try:
+        result = article.copy()
+    except Exception:
+        result = {key: article.get(key) for key in ('title', 'url', 'source', 'date', 'published_at')}
+    result['scraping_success'] = False
+    return result
+
+
+class ArticleExtractor:
+    def __init__(self, http: HttpClient,
+                 max_workers: int = CONFIG['extraction_workers'],
+                 max_per_domain: int = CONFIG['max_connections_per_domain'],
+                 timeout: float = CONFIG['timeout_seconds'],
+                 selectors: Optional[Dict[str, List[str]]] = None):
+        """
+        Inicializa el extractor
+
+        Args:
+            http (HttpClient): Cliente compartido (límite por host, reintentos, caché)
+            max_workers (int): Descargas simultáneas en total
+            max_per_domain (int): Descargas simultáneas por dominio
+            timeout (float): Timeout por request en segundos
+            selectors (dict): Selectores CSS por campo; por defecto CSS_SELECTORS
+        """
+        self.http = http
+        self.max_workers = max(1, max_workers)
+        self.max_per_domain = max(1, max_per_domain)
+        self.timeout = timeout
+        self.selectors = selectors or CSS_SELECTORS
+        self.logger = logging.getLogger(__name__)
+
+    def select_text(self, soup: BeautifulSoup, field: str, min_length: int = 1) -> str:
+        """
+        Texto del primer selector configurado para `field` que tenga contenido suficiente
+        """
+        for selector in self.selectors.get(field, []):
+            for element in soup.select(selector):
+                if field == 'date' and element.get('datetime'):
+                    return element['datetime'].strip()
+                text = element.get_text(' ', strip=True)
+                if len(text) >= min_length:
+                    return text
+        return ''
+
+    def parse(self, html: str) -> Dict[str, str]:
+        """
+        Extrae contenido, fecha y autor de una página de artículo
+        """
+        soup = BeautifulSoup(html, HTML_PARSER)
+        for tag in soup(['script', 'style', 'noscript']):
+            tag.decompose()
+        return {
+            'content': self.select_text(soup, 'content', MIN_CONTENT_LENGTH),
+            'date': self.select_text(soup, 'date'),
+            'author': self.select_text(soup, 'author'),
+        }
+
+    def extract(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Descarga y procesa un artículo; nunca lanza excepción
+
+        Returns:
+            dict: Copia del artículo con full_content, content_length, author y
+                  scraping_success actualizados (y published_at/date si eran desconocidas)
+        """
+        url = article.get('url', '')
+        try:
+            result = article.copy()
+            response = self.http.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            fields = self.parse(response.text)
+
+            if fields['content']:
+                result['full_content'] = fields['content']
+                result['content_length'] = len(fields['content'])
+            if fields['author']:
+                result['author'] = fields['author']
+            if fields['date'] and result.get('published_at') is None:
+                # Solo completa fechas desconocidas; la fecha de la fuente tiene prioridad
+                published_at = normalize_date(fields['date'])
+                if published_at:
+                    result['published_at'] = published_at
+                    result['date'] = to_display(published_at)
+            result['scraping_success'] = bool(fields['content'])
+            result['scraped_at'] = datetime.now().isoformat()
+            return result
+        except Exception as e:
+            self.logger.warning(f"No se pudo extraer contenido de {url}: {str(e)}")
+            return failed_copy(article)
+
+    def extract_many(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extrae todos los artículos manteniendo el orden de entrada
+        Cada dominio tiene su propia cola: cuando termina una descarga se lanza la
+        siguiente del mismo dominio, sin ocupar hilos esperando a sitios lentos
+        """
+        if not articles:
+            return []
+
+        queues: Dict[str, Deque[int]] = defaultdict(deque)
+        for index, article in enumerate(articles):
+            queues[normalize_host(urlparse(article.get('url', '')).netloc)].append(index)
+
+        results: List[Dict[str, Any]] = list(articles)
+        remaining = [len(articles)]
+        lock = threading.RLock()
+        finished = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def launch(domain: str) -> None:
+                index = queues[domain].popleft()
+                future = executor.submit(self.extract, articles[index])
+                future.add_done_callback(lambda f: done(domain, index, f))
+
+            def done(domain: str, index: int, future) -> None:
+                with lock:
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        self.logger.warning(f"Error inesperado extrayendo el artículo {index}: {str(e)}")
+                        results[index] = failed_copy(articles[index])
+                    finally:
+                        # Siempre se descuenta y se sigue con la cola, o finished.wait() no terminaría
+                        remaining[0] -= 1
+                        if queues[domain]:
+                            launch(domain)
+                        if remaining[0] == 0:
+                            finished.set()
+
+            with lock:
+                for domain in list(queues):
+                    for _ in range(min(self.max_per_domain, len(queues[domain]))):
+                        launch(domain)
+
+            finished.wait()
+
+        succeeded = sum(1 for a in results if a.get('scraping_success'))
+        self.logger.info(f"Contenido completo extraído de {succeeded}/{len(results)} artículos")
+        return results
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Modelo de artículo compartido por todos los scrapers
+Un registro con __slots__ en vez de un dict por artículo: menos memoria por
+artículo cuando se mantiene el historial completo en memoria y un único
+camino de serialización (to_dict / json_default). Se comporta como un
+mapping, de modo que el código que usa article.get('url') o article['title']
+funciona igual con artículos y con dicts leídos de JSON
+"""
+
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, Iterator, List, Optional
+
+# Campo derivado de full_content: se calcula al leerlo, no se almacena
+DERIVED_FIELDS = ('content_length',)
+
+
+@dataclass(slots=True, eq=False)
+class Article(MutableMapping):
+    title: str = ''
+    url: str = ''
+    source: str = ''
+    date: str = ''
+    summary: str = ''
+    image_url: str = ''
+    full_content: str = ''
+    scraped_at: str = ''
+    scraping_success: bool = True
+    is_chilean_source: bool = False
+    published_at: Optional[str] = None
+    matched_terms: List[str] = field(default_factory=list)
+    # Campos propios de algunas fuentes (author, relevance_score...); solo se crea si hace falta
+    extra: Optional[Dict[str, Any]] = None
+
+    @property
+    def content_length(self) -> int:
+        return len(self.full_content) if self.full_content else 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Article':
+        """Artículo desde un dict (JSON publicado, almacén); las claves desconocidas van a `extra`"""
+        if isinstance(data, cls):
+            return data
+        known = {name: data[name] for name in FIELD_NAMES if name in data}
+        extra = {k: v for k, v in data.items() if k not in FIELD_SET and k not in DERIVED_FIELDS}
+        return cls(**known, extra=extra or None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación publicada en iso_news.json (incluye content_length)"""
+        return dict(self.items())
+
+    def copy(self) -> 'Article':
+        return replace(self, matched_terms=list(self.matched_terms),
+                       extra=dict(self.extra) if self.extra else None)
+
+    # Interfaz de mapping (compatibilidad con el código que trata artículos como dicts)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in FIELD_SET or key in DERIVED_FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in FIELD_SET:
+            setattr(self, key, value)
+        elif key not in DERIVED_FIELDS:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if not self.extra or key not in self.extra:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for name in FIELD_NAMES:
+            yield name
+            if name == 'full_content':
+                yield from DERIVED_FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return len(FIELD_NAMES) + len(DERIVED_FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def __contains__(self, key: object) -> bool:
+        return key in FIELD_SET or key in DERIVED_FIELDS or bool(self.extra and key in self.extra)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MutableMapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+
+FIELD_NAMES = tuple(f.name for f in fields(Article) if f.name != 'extra')
+FIELD_SET = frozenset(FIELD_NAMES)
+
+
+def json_default(value: Any) -> Any:
+    """Argumento `default` de json.dumps: serializa artículos con to_dict()"""
+    if isinstance(value, Article):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Agregación de los metadatos de iso_news.json en una sola pasada
+Los contadores (chilenos/internacionales, scrapes exitosos/fallidos y conteos
+por término, medio, norma ISO y día) se actualizan mientras los artículos se
+escriben, y los N más recientes se mantienen en un heap de tamaño N en vez
+de ordenar todo el historial. Para agregar un conteo basta registrar una
+función artículo -> claves en `counters`
+"""
+
+import heapq
+import re
+from collections import Counter
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config_iso_scraper import ISO_KEYWORDS, METADATA
+
+# "ISO 9001", "ISO/IEC 27001", "NCh-ISO 45001:2018", "ISO 14.001-2015" -> norma y versión opcional
+ISO_STANDARD_RE = re.compile(
+    r'\bISO(?:\s*/\s*IEC)?[\s-]*(\d{1,2}\.?\d{3})\b(?:\s*[:-]\s*((?:19|20)\d{2})\b)?', re.I
+)
+# Normas enumeradas a continuación de la primera: "ISO 9001, 14001 y 45001:2018"
+ISO_CONTINUATION_RE = re.compile(
+    r'\s*(?:,|/|&|\by\b|\be\b|\band\b)\s*(ISO\s*)?(\d{1,2}\.?\d{3})\b(?:\s*[:-]\s*((?:19|20)\d{2})\b)?', re.I
+)
+
+# Normas que sigue el sitio: en una enumeración se aceptan sin "ISO" ni versión
+KNOWN_STANDARDS = frozenset(
+    f"ISO {match.group(1)}" for match in map(ISO_STANDARD_RE.fullmatch, ISO_KEYWORDS) if match
+)
+
+Counters = Dict[str, Callable[[Dict[str, Any]], Iterable[str]]]
+
+
+def _standard(number: str) -> Optional[str]:
+    """"14.001" -> "ISO 14001"; un número que parece año ("ISO 2015") no es una norma"""
+    number = number.replace('.', '')
+    if len(number) == 4 and 1900 <= int(number) <= 2099:
+        return None
+    return f"ISO {number}"
+
+
+def standard_mentions(text: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Normas ISO mencionadas en el texto con su versión, si se indica, en una
+    sola pasada ("ISO 9001:2015 y 14001" -> [("ISO 9001", "2015"), ("ISO 14001", None)])
+    """
+    mentions: List[Tuple[str, Optional[str]]] = []
+    consumed = 0
+    for match in ISO_STANDARD_RE.finditer(text):
+        if match.start() < consumed:
+            continue  # Ya contada como continuación de la enumeración anterior ("..., ISO 31000")
+        found = [(match.group(1), match.group(2))]
+        position = match.end()
+        while True:
+            continuation = ISO_CONTINUATION_RE.match(text, position)
+            if not continuation:
+                break
+            prefix, number, version = continuation.groups()
+            # Un número suelto solo continúa la lista si es una norma conocida o trae versión
+            # ("ISO 9001, 14001" sí; "ISO 9001, 2.500 trabajadores" no)
+            if not (prefix or version or _standard(number) in KNOWN_STANDARDS):
+                break
+            found.append((number, version))
+            position = continuation.end()
+        consumed = position
+        for number, version in found:
+            standard = _standard(number)
+            if standard:
+                mentions.append((standard, version))
+    return mentions
+
+
+def iso_standards(article: Dict[str, Any]) -> List[str]:
+    """Normas ISO mencionadas en el título o el resumen (sin repetir)"""
+    text = f"{article.get('title') or ''} {article.get('summary') or ''}"
+    return list(dict.fromkeys(standard for standard, _ in standard_mentions(text)))
+
+
+def publication_day(article: Dict[str, Any]) -> List[str]:
+    published_at = article.get('published_at')
+    return [published_at[:10] if published_at else METADATA['unknown_day']]
+
+
+# Conteos por defecto: clave de metadata -> claves que aporta cada artículo
+DEFAULT_COUNTERS: Counters = {
+    'articles_per_term': lambda a: a.get('matched_terms') or [],
+    'articles_per_outlet': lambda a: [a.get('source') or ''],
+    'articles_per_standard': iso_standards,
+    'articles_per_day': publication_day,
+}
+
+
+class MetadataAggregator:
+    def __init__(self, latest_n: int = METADATA['latest_n'], counters: Optional[Counters] = None):
+        """
+        Args:
+            latest_n (int): Artículos más recientes a conservar para metadata.latest
+            counters (dict): Conteos adicionales (o reemplazos) a DEFAULT_COUNTERS
+        """
+        self.latest_n = latest_n
+        self.counters: Counters = {**DEFAULT_COUNTERS, **(counters or {})}
+        self.counts: Dict[str, Counter] = {name: Counter() for name in self.counters}
+        self.total = 0
+        self.chilean = 0
+        self.successful = 0
+        self.failed = 0
+        # Heap mínimo de (published_at, orden de llegada, artículo) con los N más recientes
+        self._latest: List[Tuple[str, int, Dict[str, Any]]] = []
+        self._sequence = count()
+
+    def add(self, article: Dict[str, Any]) -> None:
+        self.total += 1
+        self.chilean += bool(article.get('is_chilean_source', False))
+        self.successful += bool(article.get('scraping_success', False))
+        self.failed += not article.get('scraping_success', True)
+        for name, keys in self.counters.items():
+            self.counts[name].update(keys(article))
+
+        published_at = article.get('published_at')
+        if published_at and self.latest_n > 0:
+            # A igual fecha gana el que llegó primero (orden negativo: el heap descarta el mayor)
+            entry = (published_at, -next(self._sequence), article)
+            if len(self._latest) < self.latest_n:
+                heapq.heappush(self._latest, entry)
+            elif entry[:2] > self._latest[0][:2]:
+                heapq.heapreplace(self._latest, entry)
+
+    def stream(self, articles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Agrega cada artículo a medida que se consume (p. ej. mientras se escribe el JSON)"""
+        for article in articles:
+            self.add(article)
+            yield article
+
+    def latest(self) -> List[Dict[str, Any]]:
+        """Los N artículos con fecha más recientes, del más nuevo al más antiguo"""
+        return [article for _, _, article in sorted(self._latest, key=lambda e: e[:2], reverse=True)]
+
+    def metadata(self) -> Dict[str, Any]:
+        counts = {name: dict(counter.most_common()) for name, counter in self.counts.items()}
+        if 'articles_per_day' in counts:
+            # Días más recientes primero y los artículos sin fecha al final
+            per_day = self.counts['articles_per_day']
+            unknown = per_day.get(METADATA['unknown_day'])
+            counts['articles_per_day'] = {
+                day: per_day[day] for day in sorted(per_day, reverse=True) if day != METADATA['unknown_day']
+            }
+            if unknown:
+                counts['articles_per_day'][METADATA['unknown_day']] = unknown
+        return {
+            "total_articles": self.total,
+            "chilean_articles": self.chilean,
+            "international_articles": self.total - self.chilean,
+            **counts,
+            "successful_scrapes": self.successful,
+            "failed_scrapes": self.failed,
+            "latest": [
+                {key: article.get(key) for key in ('title', 'url', 'source', 'published_at')}
+                for article in self.latest()
+            ],
+        }
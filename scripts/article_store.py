@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Almacén persistente de artículos (SQLite) detrás de los JSON del sitio
+Los scrapers hacen upsert de lo que obtienen y los archivos que importan las
+páginas Astro (iso_news.json, cms2.json, emol_pyme_noticias.json) se generan
+con consultas sobre índices, sin cargar ni reordenar todo el historial en memoria
+
+Uso:
+    python article_store.py import   # Carga los JSON publicados en el almacén
+    python article_store.py export   # Regenera los JSON (cms/, búsqueda y facetas ISO) desde el almacén
+    python article_store.py stats
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from article_model import json_default
+from config_iso_scraper import ARTICLE_STORE, HTTP_CACHE
+from date_normalizer import normalize_date
+from dedup import canonicalize_url
+from json_writer import atomic_write
+from news_shards import export_cms_shards
+from scrape_state import content_hash
+from search_index import export_search_index
+from standard_facets import export_standard_facets
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'data'))
+
+
+def _iso_news_fields(article: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'url': article.get('url') or '',
+        'title': article.get('title') or '',
+        'source': article.get('source') or '',
+        'published_at': article.get('published_at') or '',
+        'is_chilean': bool(article.get('is_chilean_source')),
+        'hash': content_hash(article),
+    }
+
+
+def _cms_fields(article: Dict[str, Any]) -> Dict[str, Any]:
+    text = ' '.join((article.get('texto') or '').split())
+    return {
+        'url': article.get('link') or '',
+        'title': text[:80],
+        'source': 'CMS Consultores',
+        'published_at': normalize_date(article.get('fecha')) or '',
+        'is_chilean': True,
+        'hash': content_hash({'title': text[:80], 'summary': text}),
+    }
+
+
+def _emol_fields(article: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'url': article.get('link_noticia') or '',
+        'title': article.get('titulo') or '',
+        'source': 'Emol',
+        'published_at': normalize_date(article.get('fecha')) or '',
+        'is_chilean': True,
+        'hash': content_hash({'title': article.get('titulo')}),
+    }
+
+
+# Colección -> (archivo publicado, extractor de columnas indexadas)
+COLLECTIONS: Dict[str, Dict[str, Any]] = {
+    'iso_news': {'file': 'iso_news.json', 'fields': _iso_news_fields},
+    'cms': {'file': 'cms2.json', 'fields': _cms_fields},
+    'emol_pyme': {'file': 'emol_pyme_noticias.json', 'fields': _emol_fields},
+}
+
+
+class ArticleStore:
+    def __init__(self, path: str):
+        """
+        Abre (o crea) la base de datos de artículos
+
+        Args:
+            path (str): Archivo SQLite
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                collection TEXT NOT NULL,
+                url TEXT NOT NULL,
+                canonical_url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                title TEXT NOT NULL,
+                source TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                is_chilean INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                UNIQUE (collection, canonical_url)
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_hash ON articles(collection, content_hash);
+            CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(collection, published_at);
+            CREATE INDEX IF NOT EXISTS idx_articles_ranking ON articles(collection, is_chilean, published_at);
+            CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(collection, source);
+        """)
+        self._conn.commit()
+
+    def upsert_many(self, collection: str, articles: Iterable[Dict[str, Any]],
+                    skip_republished: bool = True) -> Dict[str, int]:
+        """
+        Inserta o actualiza artículos (clave: URL canónica dentro de la colección)
+        Con `skip_republished`, un artículo nuevo con el mismo hash de contenido que
+        otro ya guardado bajo otra URL se considera republicación y se omite
+
+        Returns:
+            dict: Cantidad de inserted, updated y skipped
+        """
+        fields_for: Callable[[Dict[str, Any]], Dict[str, Any]] = COLLECTIONS[collection]['fields']
+        now = datetime.now().isoformat()
+        counts = {'inserted': 0, 'updated': 0, 'skipped': 0}
+        with self._conn:
+            for article in articles:
+                fields = fields_for(article)
+                canonical = canonicalize_url(fields['url'])
+                if not canonical:
+                    counts['skipped'] += 1
+                    continue
+                existing = self._conn.execute(
+                    "SELECT id FROM articles WHERE collection = ? AND canonical_url = ?", (collection, canonical)
+                ).fetchone()
+                if existing is None and skip_republished and self._conn.execute(
+                    "SELECT 1 FROM articles WHERE collection = ? AND content_hash = ? LIMIT 1",
+                    (collection, fields['hash'])
+                ).fetchone():
+                    counts['skipped'] += 1
+                    continue
+
+                values = (fields['url'], fields['hash'], fields['title'], fields['source'],
+                          fields['published_at'], int(fields['is_chilean']),
+                          json.dumps(article, ensure_ascii=False, default=json_default), now)
+                if existing:
+                    self._conn.execute("""
+                        UPDATE articles SET url = ?, content_hash = ?, title = ?, source = ?,
+                            published_at = ?, is_chilean = ?, data = ?, updated_at = ?
+                        WHERE id = ?
+                    """, values + (existing[0],))
+                    counts['updated'] += 1
+                else:
+                    self._conn.execute("""
+                        INSERT INTO articles (url, content_hash, title, source, published_at, is_chilean,
+                                              data, updated_at, collection, canonical_url, first_seen)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, values + (collection, canonical, now))
+                    counts['inserted'] += 1
+        return counts
+
+    def count(self, collection: str) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM articles WHERE collection = ?", (collection,)).fetchone()[0]
+
+    def iter_articles(self, collection: str, since: Optional[str] = None,
+                      include_undated: bool = True, chilean_first: bool = False,
+                      source: Optional[str] = None, limit: Optional[int] = None,
+                      by_date: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre los artículos de una colección, más recientes primero, sin materializarlos
+
+        Args:
+            since (str): Solo publicados desde esta fecha ISO
+            include_undated (bool): Incluir artículos sin fecha (van al final)
+            chilean_first (bool): Fuentes chilenas antes que internacionales
+            source (str): Filtrar por fuente
+            limit (int): Máximo de artículos
+            by_date (bool): False conserva el orden de inserción (orden editorial de la fuente)
+        """
+        where, params = ["collection = ?"], [collection]
+        if since:
+            where.append("(published_at >= ?" + (" OR published_at = '')" if include_undated else ")"))
+            params.append(since)
+        elif not include_undated:
+            where.append("published_at != ''")
+        if source:
+            where.append("source = ?")
+            params.append(source)
+        order = ("is_chilean DESC, " if chilean_first else "") + ("published_at DESC, id ASC" if by_date else "id ASC")
+        sql = f"SELECT data FROM articles WHERE {' AND '.join(where)} ORDER BY {order}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for (data,) in self._conn.execute(sql, params):
+            yield json.loads(data)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def default_store_path() -> str:
+    """
+    El almacén vive junto a la caché HTTP; si se pierde se reconstruye desde los JSON publicados
+    """
+    directory = os.getenv('SCRAPER_CACHE_DIR', HTTP_CACHE['directory'])
+    return os.path.join(directory, ARTICLE_STORE['file'])
+
+
+def open_default_store() -> Optional[ArticleStore]:
+    if not ARTICLE_STORE['enabled']:
+        return None
+    return ArticleStore(default_store_path())
+
+
+def _load_json(filepath: str) -> Any:
+    try:
+        with open(filepath, 'r', encoding='utf-8-sig') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def import_collection(store: ArticleStore, collection: str, data_dir: str = DATA_DIR) -> Dict[str, int]:
+    """
+    Carga en el almacén el JSON publicado de una colección (en su orden original)
+    Se conserva todo lo publicado, incluso entradas con el mismo texto, porque
+    las páginas generan sus rutas a partir de la posición de cada entrada
+    """
+    data = _load_json(os.path.join(data_dir, COLLECTIONS[collection]['file']))
+    if isinstance(data, dict):
+        articles = data.get('articles') or data.get('noticias') or []
+    else:
+        articles = data or []
+    return store.upsert_many(collection, articles, skip_republished=False)
+
+
+def export_cms(store: ArticleStore, data_dir: str = DATA_DIR) -> int:
+    """
+    Regenera cms2.json (estructura y formato que importan NewsSection y noticias.astro)
+    """
+    filepath = os.path.join(data_dir, COLLECTIONS['cms']['file'])
+    previous = _load_json(filepath) or {}
+    noticias = list(store.iter_articles('cms'))
+    document = {
+        'sitio_web': previous.get('sitio_web', 'CMS Consultores'),
+        'url': previous.get('url', 'https://www.cmsconsultores.cl'),
+        'fecha_scraping': previous.get('fecha_scraping', datetime.now().isoformat()),
+        'total_noticias': len(noticias),
+        'noticias': noticias,
+    }
+    with atomic_write(filepath) as f:
+        f.write(json.dumps(document, ensure_ascii=False, indent=4) + '\n')
+    return len(noticias)
+
+
+def export_emol_pyme(store: ArticleStore, data_dir: str = DATA_DIR) -> int:
+    """
+    Regenera emol_pyme_noticias.json (lista que importa noticias-pyme.astro)
+    en el orden de portada de Emol, que no es cronológico
+    """
+    noticias = list(store.iter_articles('emol_pyme', by_date=False))
+    with atomic_write(os.path.join(data_dir, COLLECTIONS['emol_pyme']['file'])) as f:
+        f.write(json.dumps(noticias, ensure_ascii=False, indent=2) + '\n')
+    return len(noticias)
+
+
+def main():
+    """Importa, exporta o resume el almacén de artículos"""
+    parser = argparse.ArgumentParser(description="Almacén SQLite de artículos del sitio")
+    parser.add_argument('command', choices=['import', 'export', 'stats'])
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directorio de los JSON del sitio")
+    parser.add_argument('--store', default=default_store_path(), help="Archivo SQLite del almacén")
+    args = parser.parse_args()
+
+    store = ArticleStore(args.store)
+    try:
+        if args.command == 'import':
+            for collection in COLLECTIONS:
+                counts = import_collection(store, collection, args.data_dir)
+                print(f"📥 {collection}: {counts['inserted']} nuevos, {counts['updated']} actualizados, "
+                      f"{counts['skipped']} omitidos")
+        elif args.command == 'export':
+            print(f"📤 cms2.json: {export_cms(store, args.data_dir)} noticias")
+            manifest = export_cms_shards(args.data_dir)
+            print(f"📤 cms/: {manifest['total']} noticias en {len(manifest['pages'])} páginas")
+            print(f"📤 emol_pyme_noticias.json: {export_emol_pyme(store, args.data_dir)} noticias")
+            index = export_search_index(args.data_dir)
+            print(f"📤 search/: {index['doc_count']} documentos indexados")
+            facets = export_standard_facets(args.data_dir)
+            print(f"📤 standards/: {len(facets)} normas con faceta")
+        else:
+            for collection in COLLECTIONS:
+                print(f"📊 {collection}: {store.count(collection)} artículos")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Benchmarks por etapa de los scrapers ISO
+Reproduce respuestas grabadas (fixtures/) con un servidor HTTP local y mide
+cada etapa por separado a 1x, 10x y 100x el volumen actual de artículos:
+tiempo, throughput, memoria asignada (tracemalloc) y RSS máximo del proceso.
+Compara contra baseline.json y termina con código 1 si hay regresiones.
+
+Uso (desde scripts/):
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scales 1,10 --update-baseline
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+# Sin caché HTTP y con estado incremental en un directorio temporal
+WORK_DIR = tempfile.mkdtemp(prefix='iso_bench_')
+os.environ['SCRAPER_NO_CACHE'] = '1'
+os.environ['SCRAPER_CACHE_DIR'] = WORK_DIR
+
+from config_iso_scraper import CONFIG  # noqa: E402
+from iso_news_scraper_newsapi import ISONewsScraperNewsAPI  # noqa: E402
+from iso_news_scraper_real import ISONewsScraperReal  # noqa: E402
+from rate_limiter import HostRateLimiter  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_SCALES = [1, 10, 100]
+
+# Diferencias menores a esto (segundos / bytes) se consideran ruido
+MIN_TIME_DELTA = 0.05
+MIN_ALLOC_DELTA = 1024 * 1024
+
+
+def peak_rss_mb() -> float:
+    """RSS máximo del proceso hasta el momento (ru_maxrss: KB en Linux, bytes en macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(func: Callable[[], Tuple[Any, int]], with_alloc: bool) -> Dict[str, Any]:
+    """
+    Ejecuta una etapa midiendo tiempo; si `with_alloc`, la repite bajo
+    tracemalloc para medir memoria (sin contaminar la medición de tiempo)
+
+    Args:
+        func: Devuelve (resultado, cantidad de elementos procesados)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result, items = func()
+    seconds = time.perf_counter() - start
+
+    metrics = {
+        'items': items,
+        'seconds': round(seconds, 4),
+        'items_per_second': round(items / seconds, 1) if seconds > 0 else None,
+    }
+    if with_alloc:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        metrics['alloc_peak_bytes'] = peak
+        metrics['alloc_retained_bytes'] = current
+    metrics['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    return {'result': result, 'metrics': metrics}
+
+
+def stage(results: Dict[str, Dict[str, Any]], name: str,
+          func: Callable[[], Tuple[Any, int]], with_alloc: bool) -> Any:
+    """Mide una etapa, registra sus métricas en `results` y devuelve su resultado"""
+    measured = measure(func, with_alloc)
+    results[name] = measured['metrics']
+    return measured['result']
+
+
+def run_scale(scale: int, with_alloc: bool) -> Dict[str, Dict[str, Any]]:
+    """
+    Ejecuta todas las etapas contra el servidor local con el volumen multiplicado por `scale`
+    """
+    output_dir = tempfile.mkdtemp(prefix=f'out_{scale}x_', dir=WORK_DIR)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    with StubServer(scale) as server, contextlib.redirect_stdout(io.StringIO()):
+        newsapi = ISONewsScraperNewsAPI(output_dir=output_dir, full_refresh=True)
+        newsapi.newsapi_base_url = f"{server.base_url}/v2"
+        newsapi.http.limiter = HostRateLimiter(default_rate=100000)
+
+        inn = ISONewsScraperReal()
+        inn.base_url = server.base_url
+        inn.news_url = f"{server.base_url}/inn/noticias"
+        inn.http.limiter = HostRateLimiter(default_rate=100000)
+
+        def fetch():
+            raw = newsapi.get_iso_news_from_api()
+            return raw, len(raw)
+
+        raw = stage(results, 'fetch', fetch, with_alloc)
+
+        def parse():
+            return inn.scrape_inn_news(), server.inn_item_count
+
+        stage(results, 'parse', parse, with_alloc)
+
+        def process():
+            return newsapi.process_newsapi_articles(raw), len(raw)
+
+        processed = stage(results, 'process', process, with_alloc)
+
+        def relevance():
+            return newsapi.filter_relevant(processed), len(processed)
+
+        relevant = stage(results, 'relevance', relevance, with_alloc)
+
+        def extract():
+            return newsapi.extract_full_content(relevant), min(len(relevant), CONFIG['max_articles_detailed'])
+
+        stage(results, 'extract', extract, with_alloc)
+
+        def save():
+            return newsapi.save_results_json(relevant, 'iso_news.json'), len(relevant)
+
+        stage(results, 'save', save, with_alloc)
+
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Regresiones: etapas más lentas o con más memoria que el baseline más allá de la tolerancia
+    """
+    regressions = []
+    for scale, stages in current.items():
+        for stage, metrics in stages.items():
+            base = baseline.get(scale, {}).get(stage)
+            if not base:
+                continue
+            slower = metrics['seconds'] - base['seconds']
+            if slower > MIN_TIME_DELTA and metrics['seconds'] > base['seconds'] * (1 + tolerance):
+                regressions.append(f"{scale} {stage}: {base['seconds']:.3f}s -> {metrics['seconds']:.3f}s")
+            if 'alloc_peak_bytes' in metrics and 'alloc_peak_bytes' in base:
+                grown = metrics['alloc_peak_bytes'] - base['alloc_peak_bytes']
+                if grown > MIN_ALLOC_DELTA and metrics['alloc_peak_bytes'] > base['alloc_peak_bytes'] * (1 + tolerance):
+                    regressions.append(
+                        f"{scale} {stage}: memoria {base['alloc_peak_bytes'] / 1e6:.1f}MB -> "
+                        f"{metrics['alloc_peak_bytes'] / 1e6:.1f}MB"
+                    )
+    return regressions
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    header = f"{'escala':>6} {'etapa':<10} {'items':>7} {'segundos':>9} {'items/s':>10} {'asig. MB':>9} {'RSS MB':>7}"
+    print(header)
+    print('-' * len(header))
+    for scale, stages in results.items():
+        for stage, m in stages.items():
+            alloc = f"{m['alloc_peak_bytes'] / 1e6:.1f}" if 'alloc_peak_bytes' in m else '-'
+            rate = f"{m['items_per_second']:.0f}" if m['items_per_second'] else '-'
+            print(f"{scale:>6} {stage:<10} {m['items']:>7} {m['seconds']:>9.3f} {rate:>10} {alloc:>9} {m['peak_rss_mb']:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks por etapa de los scrapers ISO")
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help="Multiplicadores del volumen actual, separados por coma")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Archivo de baseline")
+    parser.add_argument('--update-baseline', action='store_true', help="Guardar los resultados como baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Aumento relativo tolerado antes de reportar regresión")
+    parser.add_argument('--no-alloc', action='store_true', help="No medir memoria con tracemalloc")
+    parser.add_argument('--output', help="Guardar los resultados en este archivo JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+
+    results = {f"{scale}x": run_scale(scale, not args.no_alloc) for scale in scales}
+    print_report(results)
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline actualizado: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("\nℹ️ Sin baseline; ejecutar con --update-baseline para crearlo")
+        return
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f).get('results', {})
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regresiones respecto del baseline:")
+        for regression in regressions:
+            print(f"   • {regression}")
+        sys.exit(1)
+    print("\n✅ Sin regresiones respecto del baseline")
+
+
+if __name__ == "__main__":
+    main()
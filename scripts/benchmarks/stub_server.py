@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local que reproduce las respuestas grabadas en fixtures/
+multiplicadas por un factor de escala (1x, 10x, 100x del volumen actual)
+
+Rutas:
+    /v2/everything   Respuesta de NewsAPI paginada (page, pageSize)
+    /inn/noticias    Listado de noticias del INN
+    /articulos/<n>   Página de artículo (estructura de emol.com)
+"""
+
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+ITEM_RE = re.compile(r'\s*<article\b.*?</article>', re.S)
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class StubServer:
+    def __init__(self, scale: int = 1):
+        """
+        Args:
+            scale (int): Multiplicador del volumen de artículos de los fixtures
+        """
+        self.scale = scale
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.requests = 0
+
+        newsapi = json.loads(load_fixture('newsapi_everything.json'))
+        self.newsapi_articles = [
+            {**article,
+             'url': f"{self.base_url}/articulos/{copy * len(newsapi['articles']) + i}",
+             'title': article['title'] if copy == 0 else f"{article['title']} ({copy})"}
+            for copy in range(scale)
+            for i, article in enumerate(newsapi['articles'])
+        ]
+
+        listing = load_fixture('inn_noticias.html')
+        items = ITEM_RE.findall(listing)
+        copies = ''.join(
+            item.replace('href="/noticias/', f'href="/noticias/{copy}-')
+            for copy in range(scale) for item in items
+        )
+        first, last = listing.index(items[0]), listing.index(items[-1]) + len(items[-1])
+        self.inn_listing = (listing[:first] + copies + listing[last:]).encode('utf-8')
+        self.inn_item_count = len(items) * scale
+        self.article_page = load_fixture('emol_articulo.html').encode('utf-8')
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                parts = urlsplit(self.path)
+                if parts.path == '/v2/everything':
+                    self.send_body(server.newsapi_page(parse_qs(parts.query)), 'application/json')
+                elif parts.path == '/inn/noticias':
+                    self.send_body(server.inn_listing, 'text/html; charset=utf-8')
+                elif parts.path.startswith('/articulos/'):
+                    self.send_body(server.article_page, 'text/html; charset=utf-8')
+                else:
+                    self.send_error(404)
+
+            def send_body(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def newsapi_page(self, query: dict) -> bytes:
+        page = int(query.get('page', ['1'])[0])
+        page_size = int(query.get('pageSize', ['100'])[0])
+        start = (page - 1) * page_size
+        return json.dumps({
+            'status': 'ok',
+            'totalResults': len(self.newsapi_articles),
+            'articles': self.newsapi_articles[start:start + page_size],
+        }, ensure_ascii=False).encode('utf-8')
+
+    def __enter__(self) -> 'StubServer':
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
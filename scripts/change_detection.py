@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Detección de cambios en las noticias publicadas
+Calcula un hash estable sobre los campos significativos de los artículos
+(sin generated_at, scraped_at ni otras marcas de tiempo) y lo compara con
+el del manifest de la ejecución anterior, para que el workflow diario omita
+el build de Astro y el commit cuando no cambió nada sustantivo
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Sequence
+
+from config_iso_scraper import CHANGE_DETECTION
+
+
+def stable_hash(articles: Iterable[Dict[str, Any]],
+                fields: Sequence[str] = CHANGE_DETECTION['fields']) -> str:
+    """
+    SHA-256 de los campos significativos de cada artículo, en el orden publicado
+    (el orden también es contenido: define lo que muestra el sitio)
+    """
+    digest = hashlib.sha256()
+    for article in articles:
+        projected = {field: article.get(field) for field in fields}
+        digest.update(json.dumps(projected, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def detect_changes(articles: Sequence[Dict[str, Any]], manifest_path: str,
+                   fields: Sequence[str] = CHANGE_DETECTION['fields']) -> Dict[str, Any]:
+    """
+    Compara el contenido actual con el manifest anterior
+
+    Returns:
+        dict: Nuevo manifest (content_hash, previous_hash, changed, article_count,
+            fields, updated_at) si hay cambios; si no, el manifest anterior tal cual
+            con changed=False, para no reescribir el archivo
+    """
+    previous = load_manifest(manifest_path)
+    content_hash = stable_hash(articles, fields)
+    if content_hash == previous.get('content_hash'):
+        return {**previous, 'changed': False}
+    return {
+        'content_hash': content_hash,
+        'previous_hash': previous.get('content_hash'),
+        'changed': True,
+        'article_count': len(articles),
+        'fields': list(fields),
+        'updated_at': datetime.now().isoformat(),
+    }
+
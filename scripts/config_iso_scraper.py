@@ -11,6 +11,160 @@ CONFIG = {
     'max_articles_detailed': 10,  # Máximo de artículos para extraer contenido completo
     'delay_between_requests': 2,  # Segundos de pausa entre requests
     'timeout_seconds': 10,  # Timeout para requests HTTP
+    'max_workers': 8,  # Hilos concurrentes para consultas a NewsAPI
+    'newsapi_requests_per_second': 2,  # Tasa global permitida hacia NewsAPI (token bucket)
+    'extract_full_content': True,  # Descargar la página de cada artículo para el contenido completo
+    'extraction_workers': 16,  # Descargas simultáneas en la etapa de extracción
+    'max_connections_per_domain': 2,  # Descargas simultáneas por dominio en la extracción
+}
+
+# Budget de requests por segundo para cada host (token bucket independiente)
+HOST_RATE_LIMITS = {
+    'newsapi.org': CONFIG['newsapi_requests_per_second'],
+    'inn.cl': 1,
+    'emol.com': 1,
+}
+
+# Reintentos ante 429/5xx y errores de red (backoff exponencial con jitter)
+RETRY = {
+    'max_retries': 3,
+    'backoff_base': 1.0,  # Segundos base, se duplica en cada intento
+    'backoff_max': 60,  # Tope de espera por reintento (incluye Retry-After)
+}
+
+# Caché HTTP persistente (GET condicionales con ETag/Last-Modified)
+HTTP_CACHE = {
+    'enabled': True,
+    'directory': '.cache/scraper',  # Se puede sobrescribir con SCRAPER_CACHE_DIR
+    'max_bytes': 50 * 1024 * 1024,  # Desalojo LRU sobre este tamaño (comprimido)
+    'ttl_seconds': {  # Tiempo en que una respuesta se usa sin consultar al servidor
+        'newsapi.org': 6 * 3600,
+        'inn.cl': 3600,
+        'emol.com': 3600,
+        'default': 3600,
+    },
+}
+
+# Scraping incremental: high-water mark por consulta e índice de URLs vistas
+INCREMENTAL = {
+    'enabled': True,  # --full-refresh lo ignora en una ejecución puntual
+    'state_file': 'scrape_state.json',  # Dentro del directorio de la caché HTTP
+    'max_seen_urls': 20000,
+    'retention_days': 60,  # Antigüedad máxima de artículos conservados al fusionar
+}
+
+# Paginación de NewsAPI: presupuesto de requests por ejecución repartido entre
+# consultas según cuántos artículos nuevos entregó cada una en ejecuciones previas
+PAGINATION = {
+    'page_size': 100,  # Máximo permitido por NewsAPI
+    'max_pages_per_query': 10,  # Las consultas agrupadas con OR devuelven más resultados
+    'request_budget': 120,  # Páginas totales por ejecución (mínimo una por consulta)
+    'default_yield': 10.0,  # Rendimiento supuesto para consultas sin historial
+    'yield_smoothing': 0.5,  # Peso de la última ejecución en el promedio móvil
+}
+
+# Planificador de consultas: términos agrupados con OR hasta el largo máximo de `q`
+QUERY_PLANNER = {
+    'max_query_length': 500,  # Límite de NewsAPI para `q` (se mide codificado en la URL)
+    'chile_terms': ['Chile', 'chileno', 'chilena'],
+}
+
+# Almacén SQLite de artículos (historial completo; los JSON del sitio se generan desde él)
+ARTICLE_STORE = {
+    'enabled': True,
+    'file': 'articles.sqlite3',  # Dentro del directorio de la caché HTTP; se reconstruye desde los JSON
+}
+
+# Archivos fragmentados de noticias CMS para el build de Astro (news_shards.py)
+NEWS_SHARDS = {
+    'output_dir': 'cms',  # Dentro de src/data
+    'latest_n': 12,  # Noticias de latest.json (widgets de la portada)
+    'page_size': 24,  # Noticias por archivo de listado (pages/<n>.json)
+    'id_length': 10,  # Caracteres hex del id estable (hash de la URL canónica)
+    'index_file': 'index.json',  # id -> página y hash del contenido
+    'changes_file': 'changes.json',  # ids agregados/modificados/eliminados en la última exportación
+    'legacy_file': 'legacy_ids.json',  # id posicional anterior (/noticias/<n>) -> id estable
+}
+
+# Índice de búsqueda de noticias publicado en public/ (search_index.py y NewsSearch.astro)
+SEARCH_INDEX = {
+    'output_dir': 'search',  # Dentro de public/ (se sirve como /search)
+    'prefix_length': 2,  # Caracteres del término que definen su fragmento
+    'min_token_length': 2,  # Palabras más cortas no se indexan
+    'doc_block_size': 64,  # Documentos por archivo de docs/
+}
+
+# Facetas por norma ISO para las páginas de cada norma (standard_facets.py)
+STANDARD_FACETS = {
+    'output_dir': 'standards',  # Dentro de src/data: <norma>.json e index.json
+    # Además de las normas de ISO_KEYWORDS (siempre se publican, aunque estén vacías),
+    # se publican las mencionadas al menos en esta cantidad de artículos
+    'min_articles': 2,
+}
+
+# Reporte de métricas de cada ejecución (junto a iso_news.json)
+RUN_REPORT = {
+    'enabled': True,
+    'report_file': 'iso_news_run_report.json',
+    'prometheus_file': None,  # Ej: 'iso_news_metrics.prom' (también con --prometheus)
+}
+
+# Imágenes de artículos descargadas, redimensionadas y publicadas como WebP (image_pipeline.py)
+IMAGES = {
+    'enabled': True,  # Requiere Pillow; sin Pillow se conservan las URLs remotas
+    'output_dir': 'images/noticias',  # Dentro de public/ (se sirve como /images/noticias)
+    'manifest_file': 'image_manifest.json',  # En src/data: URL de origen -> imagen local
+    'thumbnail_width': 640,  # Ancho máximo de la miniatura (no se agranda)
+    'quality': 78,  # Calidad WebP de la miniatura
+    'placeholder_width': 16,  # Ancho del placeholder difuminado (data URI)
+    'max_bytes': 8 * 1024 * 1024,  # Imágenes más grandes se descartan
+    'max_workers': 6,
+    'timeout': 20,
+    'retry_failed_days': 7,  # Días antes de reintentar una URL que falló
+}
+
+# Feeds remotos que el sitio importa desde src/data en vez de pedirlos en cada build (feed_snapshot.py)
+FEED_SNAPSHOTS = {
+    'timeout': 20,
+    'unchanged_exit_code': 3,  # Código de salida con --exit-code si ningún snapshot cambió
+    'feeds': {
+        'isotools': {
+            'url': 'https://raw.githubusercontent.com/thenext90/noticias_isotools_cms/main/isotools-daily-news.json',
+            'snapshot_file': 'isotools_feed.json',  # En src/data
+            'list_keys': ['daily_news', 'data'],  # Formato nuevo y anterior del feed
+            'required_fields': ['title', 'ai_summary'],  # Texto no vacío en cada artículo
+            'min_items': 1,
+        },
+    },
+}
+
+# Normalización de fechas (date_normalizer.py)
+DATES = {
+    'cache_size': 4096,  # Cadenas de fecha distintas recordadas ya normalizadas
+    'unknown_display': 'Fecha desconocida',  # Texto de "date" cuando la fecha no se reconoce
+}
+
+# Detección de cambios: hash estable del contenido publicado (sin marcas de tiempo)
+CHANGE_DETECTION = {
+    'enabled': True,
+    'manifest_file': 'iso_news_manifest.json',  # Junto a iso_news.json
+    'fields': [  # Campos que cuentan como cambio; scraped_at, generated_at, etc. no
+        'url', 'title', 'source', 'date', 'published_at', 'summary',
+        'image_url', 'full_content', 'is_chilean_source', 'matched_terms'
+    ],
+    'unchanged_exit_code': 3,  # Código de salida con --exit-code si no hubo cambios
+}
+
+# Metadatos de iso_news.json, calculados en una sola pasada (article_stats.py)
+METADATA = {
+    'latest_n': 10,  # Artículos más recientes resumidos en metadata.latest
+    'unknown_day': 'sin_fecha',  # Clave de articles_per_day para fechas desconocidas
+}
+
+# Pipeline unificado (news_pipeline.py): fuentes que se ejecutan en paralelo
+PIPELINE = {
+    'sources': ['newsapi', 'inn'],
+    'output_file': 'iso_news.json',
 }
 
 # Consultas de búsqueda personalizables
@@ -146,6 +300,16 @@ FILTERS = {
     ]
 }
 
+# Deduplicación entre fuentes
+DEDUP = {
+    'simhash_max_distance': 5,  # Bits distintos (de 64) para considerar casi-duplicados
+    'simhash_ngram': 1,  # Palabras por shingle (1 tolera mejor textos breves reescritos)
+    'tracking_params': [  # Parámetros eliminados al canonizar URLs (además de utm_*)
+        'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid',
+        'ocid', 'ref', 'ref_src', 'cmpid', 'igshid', '_ga', 'amp'
+    ],
+}
+
 # Configuración de salida JSON
 JSON_OUTPUT = {
     'indent': 2,
@@ -153,6 +317,8 @@ JSON_OUTPUT = {
     'include_content': True,  # Incluir contenido completo de artículos
     'include_metadata': True,  # Incluir metadatos de búsqueda
     'generate_summary': True,  # Generar archivo resumen adicional
+    'compact': False,  # JSON minificado (sin indentación) para reducir tamaño
+    'jsonl_sidecar': True,  # Registro .jsonl junto al JSON para fusionar incrementalmente
 }
 
 # Configuración de logging
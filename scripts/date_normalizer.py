@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Normalización de fechas de todas las fuentes a ISO-8601 (UTC)
+Reconoce los formatos que usan las fuentes del sitio con patrones precompilados
+y una tabla de meses en español (e inglés abreviado, para RSS):
+
+    2025-07-15T12:30:00Z / 2025-07-15T09:30:00-03:00   NewsAPI
+    15/07/2025, 15-07-2025, 15.07.2025                  INN y listados (día primero)
+    Julio 02, 2025                                      cms2.json
+    19 de Agosto de 2025 / Martes 19 de agosto, 2025    emol_pyme_noticias.json
+    Tue, 15 Jul 2025 10:00:00 +0000                     feeds RSS
+
+Las cadenas repetidas se resuelven desde una caché en memoria y
+normalize_dates() procesa una columna completa resolviendo cada valor
+distinto una sola vez. Una fecha que no se reconoce es desconocida (None):
+nunca se reemplaza por la fecha actual, que altera el orden cronológico
+"""
+
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from config_iso_scraper import DATES
+
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Fecha desconocida; en JSON se publica como null
+UNKNOWN_DATE = None
+
+MONTHS = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6, 'julio': 7,
+    'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
+    'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6, 'jul': 7,
+    'ago': 8, 'sep': 9, 'set': 9, 'oct': 10, 'nov': 11, 'dic': 12,
+    'jan': 1, 'apr': 4, 'aug': 8, 'dec': 12,
+}
+
+ISO_RE = re.compile(
+    r'^\s*(\d{4})-(\d{1,2})-(\d{1,2})'
+    r'(?:[T ](\d{1,2}):(\d{2})(?::(\d{2}))?(?:\.\d+)?\s*(Z|[+-]\d{2}:?\d{2})?)?\s*$',
+    re.I
+)
+RFC_2822_RE = re.compile(r'^\s*[a-z]{3},\s+\d{1,2}\s+[a-z]{3}\s+\d{4}\s+\d{1,2}:\d{2}', re.I)
+NUMERIC_RE = re.compile(r'\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})\b')
+TEXTUAL_RE = re.compile(
+    r'(?:\b(\d{1,2})\s+(?:de\s+)?)?\b([a-záéíóú]{3,})[.,]?\s+(?:(\d{1,2}),?\s+)?(?:del?\s+)?(\d{4})\b',
+    re.I
+)
+
+
+def _iso(year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0) -> Optional[str]:
+    try:
+        return datetime(year, month, day, hour, minute, second).strftime(ISO_FORMAT)
+    except ValueError:
+        return UNKNOWN_DATE
+
+
+def _parse_iso(match: re.Match) -> Optional[str]:
+    year, month, day, hour, minute, second, offset = match.groups()
+    try:
+        parsed = datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0))
+    except ValueError:
+        return UNKNOWN_DATE
+    if offset and offset.upper() != 'Z':
+        # Con zona horaria explícita se lleva a UTC
+        parsed = datetime.fromisoformat(f"{parsed.isoformat()}{offset[:3]}:{offset[-2:]}")
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime(ISO_FORMAT)
+
+
+def _parse_rfc_2822(text: str) -> Optional[str]:
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return UNKNOWN_DATE
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime(ISO_FORMAT)
+
+
+def _parse_textual(text: str) -> Optional[str]:
+    for match in TEXTUAL_RE.finditer(text):
+        month = MONTHS.get(match.group(2).lower())
+        if month:
+            return _iso(int(match.group(4)), month, int(match.group(1) or match.group(3) or 1))
+    return UNKNOWN_DATE
+
+
+@lru_cache(maxsize=DATES['cache_size'])
+def _normalize(text: str) -> Optional[str]:
+    match = ISO_RE.match(text)
+    if match:
+        return _parse_iso(match)
+    if RFC_2822_RE.match(text):
+        return _parse_rfc_2822(text)
+    match = NUMERIC_RE.search(text)
+    if match:
+        return _iso(int(match.group(3)), int(match.group(2)), int(match.group(1)))
+    return _parse_textual(text)
+
+
+def normalize_date(value: Any) -> Optional[str]:
+    """
+    Fecha en cualquiera de los formatos de las fuentes -> "YYYY-MM-DDTHH:MM:SSZ"
+
+    Returns:
+        str | None: Fecha ISO-8601 en UTC, o UNKNOWN_DATE si no se reconoce
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.strftime(ISO_FORMAT)
+    if not isinstance(value, str) or not value.strip():
+        return UNKNOWN_DATE
+    return _normalize(value.strip())
+
+
+def normalize_dates(values: Iterable[Any]) -> List[Optional[str]]:
+    """
+    Normaliza una columna completa de fechas; cada valor distinto se resuelve una sola vez
+    """
+    values = list(values)
+    resolved: Dict[Any, Optional[str]] = {}
+    for value in values:
+        if value not in resolved:
+            resolved[value] = normalize_date(value)
+    return [resolved[value] for value in values]
+
+
+def normalize_column(records: List[Dict[str, Any]], source_field: str,
+                     target_field: Optional[str] = None) -> int:
+    """
+    Normaliza en el lugar el campo `source_field` de cada registro, dejando el
+    resultado en `target_field` (por defecto el mismo campo)
+
+    Returns:
+        int: Registros cuya fecha quedó desconocida
+    """
+    dates = normalize_dates(record.get(source_field) for record in records)
+    for record, date in zip(records, dates):
+        record[target_field or source_field] = date
+    return sum(1 for date in dates if date is UNKNOWN_DATE)
+
+
+def to_display(iso_date: Optional[str], unknown: str = DATES['unknown_display']) -> str:
+    """"2025-07-15T12:30:00Z" -> "15/07/2025" (formato que muestran los scrapers)"""
+    if not iso_date:
+        return unknown
+    return f"{iso_date[8:10]}/{iso_date[5:7]}/{iso_date[0:4]}"
+
+
+def cache_info():
+    """Aciertos y fallos de la caché de cadenas ya normalizadas"""
+    return _normalize.cache_info()
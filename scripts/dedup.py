@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Deduplicación de noticias entre fuentes
+1. URLs canónicas (sin parámetros de tracking, esquema, www ni barra final)
+2. Huella SimHash de título + contenido, agrupada con LSH por bandas para
+   colapsar casi-duplicados (notas sindicadas) en tiempo casi lineal
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config_iso_scraper import DEDUP, KNOWN_SOURCES
+from keyword_matcher import fold
+from rate_limiter import normalize_host
+
+SIMHASH_BITS = 64
+WORD_RE = re.compile(r'\w+')
+
+# Prioridad por host a partir de KNOWN_SOURCES (ej: 'inn.cl' -> 10)
+SOURCE_PRIORITY = {
+    normalize_host(urlsplit(source['base_url']).netloc): source['priority']
+    for source in KNOWN_SOURCES.values()
+}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    URL canónica para comparar: https, host sin 'www.', sin fragmento,
+    sin parámetros de tracking, parámetros ordenados y sin barra final
+    """
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    host = normalize_host(parts.netloc)
+    tracking = DEDUP['tracking_params']
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not (k.lower() in tracking or k.lower().startswith('utm_'))
+    )
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def simhash(text: str, ngram: int = DEDUP['simhash_ngram']) -> int:
+    """
+    SimHash de 64 bits sobre n-gramas de palabras del texto normalizado
+    """
+    words = WORD_RE.findall(fold(text))
+    if not words:
+        return 0
+    shingles = [' '.join(words[i:i + ngram]) for i in range(max(1, len(words) - ngram + 1))]
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def article_text(article: Dict[str, Any]) -> str:
+    body = article.get('full_content') or article.get('summary') or article.get('description') or ''
+    return f"{article.get('title') or ''} {body[:2000]}"
+
+
+def source_priority(article: Dict[str, Any]) -> tuple:
+    """
+    Orden de preferencia al colapsar duplicados: prioridad de KNOWN_SOURCES,
+    fuente chilena y luego contenido más completo
+    """
+    host = normalize_host(urlsplit(article.get('url') or '').netloc)
+    parts = host.split('.')
+    priority = next(
+        (SOURCE_PRIORITY['.'.join(parts[i:])] for i in range(len(parts)) if '.'.join(parts[i:]) in SOURCE_PRIORITY),
+        0
+    )
+    return (
+        priority,
+        bool(article.get('is_chilean_source')),
+        article.get('content_length') or len(article.get('full_content') or ''),
+    )
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def deduplicate(articles: Iterable[Dict[str, Any]],
+                max_distance: int = DEDUP['simhash_max_distance'],
+                bands: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Colapsa duplicados exactos (URL canónica) y casi-duplicados (SimHash)
+
+    Con `bands` > max_distance, dos huellas a distancia <= max_distance coinciden
+    por el principio del palomar en al menos una banda, así que solo se comparan
+    los artículos que comparten algún bucket
+
+    Returns:
+        list: Un artículo por grupo (el de mayor prioridad), en el orden de
+              aparición del primer miembro de cada grupo
+    """
+    items = list(articles)
+    bands = bands or max_distance + 1
+    band_bits = SIMHASH_BITS // bands
+    band_mask = (1 << band_bits) - 1
+    groups = _UnionFind(len(items))
+
+    by_url: Dict[str, int] = {}
+    by_fingerprint: Dict[int, int] = {}
+    buckets: Dict[tuple, List[int]] = defaultdict(list)
+    fingerprints: List[int] = []
+
+    for index, article in enumerate(items):
+        url = canonicalize_url(article.get('url', ''))
+        if url in by_url:
+            groups.union(by_url[url], index)
+        elif url:
+            by_url[url] = index
+
+        fingerprint = simhash(article_text(article))
+        fingerprints.append(fingerprint)
+        if not fingerprint:
+            continue
+        # Huella idéntica: basta unir con la primera, sin volver a poblar los buckets
+        if fingerprint in by_fingerprint:
+            groups.union(by_fingerprint[fingerprint], index)
+            continue
+        by_fingerprint[fingerprint] = index
+        for band in range(bands):
+            key = (band, fingerprint >> (band * band_bits) & band_mask)
+            for other in buckets[key]:
+                if hamming_distance(fingerprint, fingerprints[other]) <= max_distance:
+                    groups.union(other, index)
+            buckets[key].append(index)
+
+    best: Dict[int, int] = {}
+    for index, article in enumerate(items):
+        root = groups.find(index)
+        if root not in best or source_priority(article) > source_priority(items[best[root]]):
+            best[root] = index
+
+    return [items[best[root]] for root in sorted(best)]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Snapshots locales de feeds remotos para el build de Astro
+Descarga cada feed de FEED_SNAPSHOTS con un GET condicional (ETag /
+Last-Modified guardados en el propio snapshot), valida su estructura y lo
+guarda en src/data/ junto con el hash de su contenido. Los componentes
+importan el snapshot en vez de pedir el feed en cada build; si el origen
+falla o entrega algo inválido se conserva el último snapshot bueno
+
+Uso:
+    python feed_snapshot.py                  # Todos los feeds
+    python feed_snapshot.py --feed isotools --exit-code
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import requests
+
+from config_iso_scraper import FEED_SNAPSHOTS, USER_AGENTS
+from http_client import HttpClient
+from json_writer import write_json
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'data'))
+
+
+class FeedValidationError(ValueError):
+    """El feed descargado no tiene la estructura esperada"""
+
+
+def content_hash(feed: Any) -> str:
+    """SHA-256 del JSON canónico del feed (independiente del formato del servidor)"""
+    canonical = json.dumps(feed, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def validate_feed(feed: Any, spec: Dict[str, Any]) -> int:
+    """
+    Verifica que el feed tenga la lista de artículos y los campos que usa el sitio
+
+    Returns:
+        int: Cantidad de artículos
+
+    Raises:
+        FeedValidationError: Si falta la lista, tiene menos de min_items o un artículo está incompleto
+    """
+    if not isinstance(feed, dict):
+        raise FeedValidationError("el feed no es un objeto JSON")
+    items = next((feed[key] for key in spec['list_keys'] if isinstance(feed.get(key), list)), None)
+    if items is None:
+        raise FeedValidationError(f"sin lista de artículos ({', '.join(spec['list_keys'])})")
+    if len(items) < spec['min_items']:
+        raise FeedValidationError(f"{len(items)} artículos (mínimo {spec['min_items']})")
+    for position, item in enumerate(items):
+        missing = [f for f in spec['required_fields']
+                   if not isinstance(item, dict) or not isinstance(item.get(f), str) or not item[f].strip()]
+        if missing:
+            raise FeedValidationError(f"artículo {position} sin {', '.join(missing)}")
+    return len(items)
+
+
+def load_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        return snapshot if isinstance(snapshot, dict) and 'feed' in snapshot else None
+    except (OSError, ValueError):
+        return None
+
+
+def refresh_snapshot(name: str, spec: Dict[str, Any], data_dir: str = DATA_DIR,
+                     http: Optional[HttpClient] = None) -> Dict[str, Any]:
+    """
+    Actualiza el snapshot de un feed
+
+    Returns:
+        dict: name, status ('updated', 'not_modified', 'unchanged' o 'failed'),
+            content_hash vigente y error si lo hubo
+    """
+    path = os.path.join(data_dir, spec['snapshot_file'])
+    previous = load_snapshot(path)
+    current_hash = previous.get('content_hash') if previous else None
+
+    headers = {}
+    if previous and previous.get('etag'):
+        headers['If-None-Match'] = previous['etag']
+    if previous and previous.get('last_modified'):
+        headers['If-Modified-Since'] = previous['last_modified']
+
+    if http is None:
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENTS[0]})
+        http = HttpClient(session=session)
+
+    def failed(error: str) -> Dict[str, Any]:
+        kept = "se conserva el snapshot anterior" if previous else "no hay snapshot previo"
+        logger.warning(f"Feed '{name}': {error}; {kept}")
+        return {'name': name, 'status': 'failed', 'content_hash': current_hash, 'error': error}
+
+    try:
+        response = http.get(spec['url'], headers=headers, timeout=FEED_SNAPSHOTS['timeout'])
+    except requests.exceptions.RequestException as e:
+        return failed(type(e).__name__)
+    if response.status_code == 304 and previous:
+        logger.info(f"Feed '{name}': sin cambios (304)")
+        return {'name': name, 'status': 'not_modified', 'content_hash': current_hash}
+    if response.status_code != 200:
+        return failed(f"HTTP {response.status_code}")
+
+    try:
+        feed = response.json()
+        count = validate_feed(feed, spec)
+    except ValueError as e:  # JSON inválido o FeedValidationError
+        return failed(f"feed inválido: {e}")
+
+    new_hash = content_hash(feed)
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if new_hash == current_hash:
+        # Mismo contenido: solo se reescribe si cambiaron los validadores del servidor
+        if (etag, last_modified) != (previous.get('etag'), previous.get('last_modified')):
+            write_json(path, {**previous, 'etag': etag, 'last_modified': last_modified}, compact=False)
+        logger.info(f"Feed '{name}': contenido idéntico ({new_hash[:12]})")
+        return {'name': name, 'status': 'unchanged', 'content_hash': new_hash}
+
+    write_json(path, {
+        'source_url': spec['url'],
+        'content_hash': new_hash,
+        'etag': etag,
+        'last_modified': last_modified,
+        'fetched_at': datetime.now().isoformat(),
+        'item_count': count,
+        'feed': feed,
+    }, compact=False)
+    logger.info(f"Feed '{name}': snapshot actualizado con {count} artículos ({new_hash[:12]})")
+    return {'name': name, 'status': 'updated', 'content_hash': new_hash}
+
+
+def refresh_all(names: Optional[list] = None, data_dir: str = DATA_DIR) -> Dict[str, Dict[str, Any]]:
+    feeds = FEED_SNAPSHOTS['feeds']
+    unknown = [name for name in names or [] if name not in feeds]
+    if unknown:
+        raise ValueError(f"Feeds desconocidos: {', '.join(unknown)}")
+    return {name: refresh_snapshot(name, feeds[name], data_dir) for name in names or feeds}
+
+
+def main():
+    """Actualiza los snapshots de los feeds remotos"""
+    parser = argparse.ArgumentParser(description="Snapshots locales de feeds remotos para el sitio")
+    parser.add_argument('--feed', action='append', dest='feeds', help="Feed a actualizar (repetible)")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directorio de los JSON del sitio")
+    parser.add_argument('--exit-code', action='store_true',
+                        help=f"Salir con {FEED_SNAPSHOTS['unchanged_exit_code']} si ningún snapshot cambió")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    results = refresh_all(args.feeds, args.data_dir)
+    for result in results.values():
+        icon = {'updated': '🆕', 'failed': '⚠️'}.get(result['status'], '💤')
+        print(f"{icon} {result['name']}: {result['status']}")
+
+    if any(r['status'] == 'failed' and r['content_hash'] is None for r in results.values()):
+        # Sin snapshot previo el componente no tendría datos: se reporta como error
+        sys.exit(1)
+    if args.exit_code and not any(r['status'] == 'updated' for r in results.values()):
+        sys.exit(FEED_SNAPSHOTS['unchanged_exit_code'])
+
+
+if __name__ == "__main__":
+    main()
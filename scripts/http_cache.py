@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Caché persistente de respuestas HTTP (SQLite) para los scrapers ISO
+Permite GET condicionales (If-None-Match / If-Modified-Since) entre ejecuciones
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config_iso_scraper import HTTP_CACHE
+from rate_limiter import normalize_host
+
+# Parámetros que nunca deben formar parte de la clave (credenciales)
+SECRET_PARAMS = {'apikey', 'api_key', 'key', 'token', 'access_token'}
+
+# Headers de la respuesta que se guardan junto al cuerpo
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Date', 'Cache-Control')
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None,
+              secret_params: Iterable[str] = SECRET_PARAMS) -> str:
+    """
+    Clave normalizada: esquema y host en minúsculas, parámetros ordenados y sin credenciales
+    """
+    prepared = requests.Request('GET', url, params=params).prepare().url
+    parts = urlsplit(prepared)
+    secrets = {p.lower() for p in secret_params}
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in secrets
+    )
+    path = parts.path or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+def redact_url(url: str, secret_params: Iterable[str] = SECRET_PARAMS) -> str:
+    """
+    URL sin los parámetros con credenciales (conserva el orden de los demás);
+    es la que se guarda en la caché y se devuelve en los aciertos
+    """
+    parts = urlsplit(url)
+    secrets = {p.lower() for p in secret_params}
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in secrets]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+class ResponseCache:
+    def __init__(self, directory: str, ttl_seconds: Optional[Dict[str, float]] = None,
+                 max_bytes: int = 50 * 1024 * 1024):
+        """
+        Inicializa la caché
+
+        Args:
+            directory (str): Directorio del archivo SQLite (restaurable entre ejecuciones)
+            ttl_seconds (dict): Frescura por host; la clave 'default' aplica al resto
+            max_bytes (int): Tamaño máximo de cuerpos comprimidos antes de desalojar (LRU)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'http_cache.sqlite3')
+        self.ttl_seconds = {normalize_host(k) if k != 'default' else k: v
+                            for k, v in (ttl_seconds or {}).items()}
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._redact_stored_urls()
+        self._conn.commit()
+
+    def _redact_stored_urls(self) -> None:
+        """Quita credenciales de las URLs guardadas por versiones anteriores de la caché"""
+        rows = self._conn.execute("SELECT key, url FROM responses").fetchall()
+        for key, url in rows:
+            redacted = redact_url(url)
+            if redacted != url:
+                self._conn.execute("UPDATE responses SET url = ? WHERE key = ?", (redacted, key))
+
+    def ttl_for(self, url: str) -> float:
+        host = normalize_host(urlsplit(url).netloc)
+        return self.ttl_seconds.get(host, self.ttl_seconds.get('default', 0))
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve la entrada guardada (con 'fresh' indicando si sigue vigente) o None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, headers, body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        url, headers, body, etag, last_modified, stored_at = row
+        return {
+            'url': url,
+            'headers': json.loads(headers),
+            'body': zlib.decompress(body),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fresh': now - stored_at < self.ttl_for(url),
+        }
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """
+        Guarda una respuesta 200 comprimida (URL sin credenciales) y aplica el límite de tamaño
+        """
+        headers = {h: response.headers[h] for h in STORED_HEADERS if h in response.headers}
+        body = zlib.compress(response.content)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, headers, body, size, etag, last_modified, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, redact_url(response.url) if response.url else key, json.dumps(headers), body, len(body),
+                 headers.get('ETag'), headers.get('Last-Modified'), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """
+        Marca una entrada como revalidada (respuesta 304) reiniciando su TTL
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def build_response(self, entry: Dict[str, Any]) -> requests.Response:
+        """
+        Reconstruye un requests.Response a partir de una entrada de la caché
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response._content = entry['body']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.url = entry['url']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_default_cache() -> Optional[ResponseCache]:
+    """
+    Abre la caché según HTTP_CACHE; SCRAPER_CACHE_DIR permite moverla (ej: en CI)
+    """
+    if not HTTP_CACHE['enabled'] or os.getenv('SCRAPER_NO_CACHE'):
+        return None
+    directory = os.getenv('SCRAPER_CACHE_DIR', HTTP_CACHE['directory'])
+    return ResponseCache(directory, HTTP_CACHE['ttl_seconds'], HTTP_CACHE['max_bytes'])
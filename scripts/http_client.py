@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Cliente HTTP compartido por los scrapers ISO
+Aplica límite de tasa por host, reintentos con backoff exponencial + jitter
+y respeta Retry-After en respuestas 429/503
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config_iso_scraper import HOST_RATE_LIMITS, RETRY
+from http_cache import ResponseCache, cache_key
+from rate_limiter import HostRateLimiter, normalize_host
+from run_metrics import METRICS, RunMetrics
+
+# Códigos que justifican reintentar el request
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Interpreta el header Retry-After (segundos o fecha HTTP)
+
+    Returns:
+        float: Segundos a esperar, o None si el header no es válido
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpClient:
+    def __init__(self, session: Optional[requests.Session] = None,
+                 limiter: Optional[HostRateLimiter] = None,
+                 max_retries: int = RETRY['max_retries'],
+                 backoff_base: float = RETRY['backoff_base'],
+                 backoff_max: float = RETRY['backoff_max'],
+                 pool_size: int = 10,
+                 cache: Optional[ResponseCache] = None,
+                 metrics: Optional[RunMetrics] = METRICS):
+        """
+        Inicializa el cliente
+
+        Args:
+            session (requests.Session): Sesión a reutilizar (headers propios del scraper)
+            limiter (HostRateLimiter): Limitador por host; por defecto HOST_RATE_LIMITS
+            max_retries (int): Reintentos tras el primer intento
+            backoff_base (float): Segundos base del backoff exponencial
+            backoff_max (float): Tope de espera por reintento
+            pool_size (int): Conexiones por host en el pool
+            cache (ResponseCache): Caché persistente para GET (None la desactiva)
+            metrics (RunMetrics): Métricas de la ejecución (latencia, bytes y contadores por host)
+        """
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.limiter = limiter or HostRateLimiter(HOST_RATE_LIMITS)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+        self.metrics = metrics
+        self.logger = logging.getLogger(__name__)
+
+        self._counters: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+
+    def _count(self, host: str, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[host][key] += amount
+        if self.metrics is not None:
+            self.metrics.count_host(host, key, amount)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Backoff exponencial con jitter completo"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Ejecuta un request respetando el budget del host y reintentando fallos transitorios
+        Los GET pasan por la caché: entradas frescas no tocan la red y las vencidas
+        se revalidan con If-None-Match / If-Modified-Since
+
+        Returns:
+            requests.Response: Última respuesta obtenida (el llamador revisa status_code)
+
+        Raises:
+            requests.exceptions.RequestException: Si todos los intentos fallan por red
+        """
+        host = normalize_host(urlparse(url).netloc)
+        if self.cache is None or method.upper() != 'GET':
+            return self._send(method, url, host, **kwargs)
+
+        key = cache_key(url, kwargs.get('params'))
+        entry = self.cache.lookup(key)
+        if entry is not None and entry['fresh']:
+            self._count(host, 'cache_hits')
+            return self.cache.build_response(entry)
+
+        if entry is not None:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **self.cache.conditional_headers(entry)}
+
+        response = self._send(method, url, host, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self._count(host, 'cache_revalidated')
+            self.cache.touch(key)
+            return self.cache.build_response(entry)
+        if response.status_code == 200:
+            self._count(host, 'cache_misses')
+            self.cache.store(key, response)
+        return response
+
+    def _send(self, method: str, url: str, host: str, **kwargs: Any) -> requests.Response:
+        """Envía el request con límite de tasa y reintentos (sin caché)"""
+        for attempt in range(self.max_retries + 1):
+            waited = self.limiter.acquire(host)
+            self._count(host, 'wait_seconds', waited)
+            self._count(host, 'requests')
+
+            start = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+                if self.metrics is not None:
+                    self.metrics.observe_request(host, time.monotonic() - start, len(response.content))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._count(host, 'errors')
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                self.logger.warning(f"Error de red con {host} ({e}), reintento en {delay:.1f}s")
+                self._count(host, 'retries')
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRYABLE_STATUS:
+                return response
+
+            if response.status_code == 429:
+                self._count(host, 'throttled')
+            else:
+                self._count(host, 'errors')
+
+            if attempt >= self.max_retries:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = min(retry_after, self.backoff_max)
+                # El servidor pidió esperar: pausar al host completo, no solo a este hilo
+                self.limiter.block(host, delay)
+            else:
+                delay = self.backoff_delay(attempt)
+                time.sleep(delay)
+
+            self._count(host, 'retries')
+            self.logger.warning(
+                f"{host} respondió {response.status_code}, reintento {attempt + 1}/{self.max_retries} en {delay:.1f}s"
+            )
+
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Contadores por host: requests, retries, throttled, errors, wait_seconds,
+        cache_hits, cache_revalidated, cache_misses
+        """
+        with self._lock:
+            return {host: dict(counters) for host, counters in self._counters.items()}
+
+    def log_stats(self) -> None:
+        for host, counters in sorted(self.stats().items()):
+            self.logger.info(
+                f"{host}: {int(counters.get('requests', 0))} requests, "
+                f"{int(counters.get('retries', 0))} reintentos, "
+                f"{int(counters.get('throttled', 0))} respuestas 429, "
+                f"{int(counters.get('cache_hits', 0) + counters.get('cache_revalidated', 0))} desde caché, "
+                f"{counters.get('wait_seconds', 0):.1f}s en espera"
+            )
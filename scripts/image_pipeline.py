@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Imágenes de los artículos servidas desde el propio sitio
+Descarga en paralelo las imágenes remotas (image_url de NewsAPI, imagen de
+cms2.json, link_imagen de emol_pyme_noticias.json), las deduplica por hash
+de contenido y genera en public/images/noticias/ una miniatura WebP
+redimensionada más un placeholder difuminado diminuto (data URI). El
+manifest src/data/image_manifest.json recuerda cada URL ya procesada, de
+modo que una imagen se descarga y codifica una sola vez entre ejecuciones.
+
+Pillow es opcional: sin Pillow no se procesan imágenes nuevas y los JSON
+conservan las URLs remotas (las ya procesadas se siguen reescribiendo)
+
+Uso:
+    python image_pipeline.py                      # Emol y fragmentos de cms2.json
+    python image_pipeline.py --collections emol
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+from config_iso_scraper import IMAGES, USER_AGENTS
+from http_client import HttpClient
+from json_writer import atomic_write, write_json
+from run_metrics import METRICS
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow es opcional
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+PUBLIC_DIR = os.path.join(ROOT_DIR, 'public')
+DATA_DIR = os.path.join(ROOT_DIR, 'src', 'data')
+
+
+class ImagePipeline:
+    def __init__(self, public_dir: str = PUBLIC_DIR, manifest_path: Optional[str] = None,
+                 http: Optional[HttpClient] = None, max_workers: int = IMAGES['max_workers']):
+        """
+        Args:
+            public_dir (str): Directorio public/ del sitio Astro
+            manifest_path (str): Manifest de imágenes procesadas (por defecto en src/data)
+            http (HttpClient): Cliente HTTP (sin caché de respuestas: las imágenes no se guardan ahí)
+            max_workers (int): Descargas simultáneas
+        """
+        self.output_dir = os.path.join(public_dir, IMAGES['output_dir'])
+        self.url_prefix = '/' + IMAGES['output_dir'].strip('/')
+        self.manifest_path = manifest_path or os.path.join(DATA_DIR, IMAGES['manifest_file'])
+        self.max_workers = max_workers
+        if http is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': USER_AGENTS[0]})
+            http = HttpClient(session=session)
+        self.http = http
+
+        self.images: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.images = json.load(f).get('images', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        # hash de contenido -> entrada ya codificada (la misma imagen publicada bajo otra URL)
+        self.by_hash = {entry['hash']: entry for entry in self.images.values() if entry.get('src')}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._warned = False
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def _needs_processing(self, url: str) -> bool:
+        entry = self.images.get(url)
+        if entry is None:
+            return True
+        if entry.get('src'):
+            return False
+        retry_after = datetime.now() - timedelta(days=IMAGES['retry_failed_days'])
+        return entry.get('failed_at', '') < retry_after.isoformat()
+
+    @METRICS.timed('images')
+    def process(self, urls: Iterable[Optional[str]]) -> int:
+        """
+        Descarga y codifica las URLs aún no procesadas
+
+        Returns:
+            int: Imágenes nuevas publicadas
+        """
+        pending = [
+            url for url in dict.fromkeys(urls)
+            if url and url.startswith(('http://', 'https://')) and self._needs_processing(url)
+        ]
+        if not pending:
+            return 0
+        if not self.available:
+            if not self._warned:
+                logger.warning(f"Pillow no está instalado: {len(pending)} imágenes quedan con su URL remota")
+                self._warned = True
+            return 0
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._ingest, pending))
+
+        published = 0
+        for url, entry in zip(pending, results):
+            self.images[url] = entry
+            published += bool(entry.get('src'))
+        self._dirty = True
+        METRICS.record_filter('images', len(pending), published)
+        logger.info(f"Imágenes: {published} de {len(pending)} nuevas publicadas en {self.url_prefix}")
+        return published
+
+    def _ingest(self, url: str) -> Dict[str, Any]:
+        """Descarga, deduplica y codifica una imagen; los errores quedan registrados en la entrada"""
+        failed = {'failed_at': datetime.now().isoformat()}
+        try:
+            response = self.http.get(url, timeout=IMAGES['timeout'])
+        except requests.exceptions.RequestException as e:
+            return {**failed, 'error': type(e).__name__}
+        if response.status_code != 200:
+            return {**failed, 'error': f"HTTP {response.status_code}"}
+        data = response.content
+        if len(data) > IMAGES['max_bytes']:
+            return {**failed, 'error': 'too_large'}
+
+        digest = hashlib.sha256(data).hexdigest()[:20]
+        with self._lock:
+            existing = self.by_hash.get(digest)
+        if existing:
+            return dict(existing)
+
+        try:
+            entry = self._encode(data, digest)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            return {**failed, 'error': type(e).__name__}
+        with self._lock:
+            self.by_hash[digest] = entry
+        return dict(entry)
+
+    def _encode(self, data: bytes, digest: str) -> Dict[str, Any]:
+        """Miniatura WebP (publicada con nombre = hash de contenido) y placeholder difuminado"""
+        with Image.open(io.BytesIO(data)) as source:
+            image = ImageOps.exif_transpose(source)
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        width = IMAGES['thumbnail_width']
+        image.thumbnail((width, width * 4))
+        filename = f"{digest}.webp"
+        filepath = os.path.join(self.output_dir, filename)
+        if not os.path.exists(filepath):
+            buffer = io.BytesIO()
+            image.save(buffer, 'WEBP', quality=IMAGES['quality'], method=6)
+            with atomic_write(filepath, binary=True) as f:
+                f.write(buffer.getvalue())
+
+        placeholder = image.copy()
+        placeholder.thumbnail((IMAGES['placeholder_width'], IMAGES['placeholder_width'] * 4))
+        buffer = io.BytesIO()
+        placeholder.save(buffer, 'WEBP', quality=40)
+
+        return {
+            'hash': digest,
+            'src': f"{self.url_prefix}/{filename}",
+            'width': image.width,
+            'height': image.height,
+            'placeholder': 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii'),
+        }
+
+    def resolve(self, url: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Entrada publicada para una URL remota (None si no hay imagen local)"""
+        entry = self.images.get(url) if url else None
+        return entry if entry and entry.get('src') else None
+
+    def localize(self, records: List[Dict[str, Any]], field: str) -> int:
+        """
+        Reemplaza en el lugar la URL remota de `field` por la imagen local y agrega
+        `<field>_placeholder` y `<field>_original` (URL de origen)
+
+        Returns:
+            int: Registros que apuntan a una imagen local
+        """
+        self.process(record.get(field) for record in records)
+        localized = 0
+        for record in records:
+            entry = self.resolve(record.get(field))
+            if entry:
+                record[f"{field}_original"] = record[field]
+                record[field] = entry['src']
+                record[f"{field}_placeholder"] = entry['placeholder']
+            if (record.get(field) or '').startswith(self.url_prefix):
+                localized += 1
+        return localized
+
+    def save(self) -> None:
+        """Guarda el manifest si se procesaron imágenes nuevas (ordenado, para diffs estables)"""
+        if self._dirty:
+            write_json(self.manifest_path, {'images': dict(sorted(self.images.items()))}, compact=False)
+            self._dirty = False
+
+
+def localize_emol(images: ImagePipeline, data_dir: str = DATA_DIR) -> int:
+    """Reescribe emol_pyme_noticias.json para que link_imagen apunte a las imágenes locales"""
+    filepath = os.path.join(data_dir, 'emol_pyme_noticias.json')
+    with open(filepath, 'r', encoding='utf-8') as f:
+        noticias = json.load(f)
+    localized = images.localize(noticias, 'link_imagen')
+    write_json(filepath, noticias, compact=False)
+    return localized
+
+
+def main():
+    """Publica localmente las imágenes de las colecciones indicadas"""
+    parser = argparse.ArgumentParser(description="Imágenes locales (WebP) para las noticias del sitio")
+    parser.add_argument('--collections', default='emol,cms', help="Colecciones separadas por coma (emol, cms)")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directorio de los JSON del sitio")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    collections = [name.strip() for name in args.collections.split(',') if name.strip()]
+    images = ImagePipeline()
+    if not images.available:
+        print("⚠️ Pillow no está instalado (pip install pillow): solo se reutilizan imágenes ya procesadas")
+
+    if 'emol' in collections:
+        print(f"🖼️ emol_pyme_noticias.json: {localize_emol(images, args.data_dir)} imágenes locales")
+    if 'cms' in collections:
+        from news_shards import export_cms_shards
+        manifest = export_cms_shards(args.data_dir, images=images)
+        print(f"🖼️ cms/: {manifest['total']} noticias, {manifest['images']} con imagen local")
+    images.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,19 @@ Busca noticias del mundo en español, con prioridad en Chile
 """
 
 import requests
-import json
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-import time
 import logging
 
+from article_extractor import ArticleExtractor
+from article_model import Article
+from date_normalizer import normalize_dates, to_display
+from http_cache import open_default_cache
+from http_client import HttpClient
+from json_writer import write_articles_json
+from keyword_matcher import DomainMatcher
+
 class ISONewsScraperEnhanced:
     def __init__(self, output_dir: str = r"src/data"):
         """
@@ -19,6 +25,7 @@ class ISONewsScraperEnhanced:
         """
         self.output_dir = output_dir
         self.session = requests.Session()
+        self.http = HttpClient(self.session, cache=open_default_cache())
         
         # NewsAPI Configuration
         self.newsapi_key = os.getenv('NEWSAPI_KEY', 'a5b0b5d5ed814c2b9b1f8a8c8e8f8e8f')  # Placeholder
@@ -45,11 +52,11 @@ class ISONewsScraperEnhanced:
         ]
         
         # Dominios chilenos específicos para filtrar
-        self.chilean_domains = [
+        self.chilean_domains = DomainMatcher([
             'emol.com', 'latercera.com', 'lun.com', 'df.cl',
             'cooperativa.cl', 'biobiochile.cl', 'adnradio.cl',
             'cnnchile.com', 't13.cl', 'meganoticias.cl'
-        ]
+        ])
 
     def search_newsapi(self, query: str, language: str = 'es', days_back: int = 30) -> List[Dict[str, Any]]:
         """
@@ -72,7 +79,7 @@ class ISONewsScraperEnhanced:
         
         try:
             # Buscar en everything endpoint (más amplio)
-            response = self.session.get(f"{self.newsapi_base_url}/everything", params=params)
+            response = self.http.get(f"{self.newsapi_base_url}/everything", params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -106,7 +113,7 @@ class ISONewsScraperEnhanced:
             
             # Verificar si es relevante para Chile
             is_chilean = (
-                any(domain in url for domain in self.chilean_domains) or
+                self.chilean_domains.matches(url) or
                 'chile' in title or 'chile' in description or
                 'chileno' in title or 'chileno' in description or
                 'chilena' in title or 'chilena' in description
@@ -134,9 +141,6 @@ class ISONewsScraperEnhanced:
             # Búsqueda específica en fuentes chilenas
             chilean_articles = self.search_chilean_sources(term)
             all_articles.extend(chilean_articles)
-            
-            # Pausa entre búsquedas para respetar límites de API
-            time.sleep(1)
         
         # Eliminar duplicados basándose en URL
         unique_articles = {}
@@ -152,48 +156,41 @@ class ISONewsScraperEnhanced:
         Procesa artículos de NewsAPI al formato esperado
         """
         processed_articles = []
+        # Fechas de toda la columna de una vez (los valores repetidos se resuelven una sola vez)
+        published_dates = normalize_dates(article.get('publishedAt') for article in articles)
         
-        for article in articles:
+        for article, published_at in zip(articles, published_dates):
             try:
                 # Extraer información básica
                 title = article.get('title', 'Sin título')
                 url = article.get('url', '')
                 source_name = article.get('source', {}).get('name', 'Fuente desconocida')
-                published_at = article.get('publishedAt', '')
                 description = article.get('description', '')
                 image_url = article.get('urlToImage', '')
                 content = article.get('content', '')
                 
-                # Formatear fecha
-                try:
-                    if published_at:
-                        date_obj = datetime.strptime(published_at, '%Y-%m-%dT%H:%M:%SZ')
-                        formatted_date = date_obj.strftime('%d/%m/%Y')
-                    else:
-                        formatted_date = datetime.now().strftime('%d/%m/%Y')
-                except:
-                    formatted_date = datetime.now().strftime('%d/%m/%Y')
+                # Formatear fecha (sin fecha válida queda como desconocida, no como hoy)
+                formatted_date = to_display(published_at)
                 
                 # Crear resumen
                 summary = description if description else (content[:200] + '...' if content and len(content) > 200 else content)
                 
                 # Determinar si es de Chile
-                is_chilean = any(domain in url for domain in self.chilean_domains)
+                is_chilean = self.chilean_domains.matches(url)
                 
-                processed_article = {
-                    'title': title,
-                    'url': url,
-                    'source': f"{source_name}{'🇨🇱' if is_chilean else '🌍'}",
-                    'date': formatted_date,
-                    'summary': summary,
-                    'image_url': image_url,
-                    'full_content': content,
-                    'content_length': len(content) if content else 0,
-                    'scraped_at': datetime.now().isoformat(),
-                    'scraping_success': True,
-                    'is_chilean_source': is_chilean,
-                    'published_at': published_at
-                }
+                processed_article = Article(
+                    title=title,
+                    url=url,
+                    source=f"{source_name}{'🇨🇱' if is_chilean else '🌍'}",
+                    date=formatted_date,
+                    summary=summary,
+                    image_url=image_url,
+                    full_content=content,
+                    scraped_at=datetime.now().isoformat(),
+                    scraping_success=True,
+                    is_chilean_source=is_chilean,
+                    published_at=published_at
+                )
                 
                 processed_articles.append(processed_article)
                 
@@ -203,26 +200,28 @@ class ISONewsScraperEnhanced:
         
         return processed_articles
     
+    def scrape_direct_urls(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extrae el contenido completo de cada artículo (descargas concurrentes con tope por dominio)
+        """
+        return ArticleExtractor(self.http).extract_many(articles)
+
     def save_results_json(self, data: List[Dict[str, Any]], filename: str) -> str:
         """
         Guarda los resultados en formato JSON
         """
         filepath = os.path.join(self.output_dir, filename)
         
-        output_data = {
-            "metadata": {
-                "generated_at": datetime.now().isoformat(),
-                "data_source": self.inn_news_url,
-                "total_articles": len(data),
-                "successful_scrapes": len([a for a in data if a.get('scraping_success', False)]),
-                "failed_scrapes": len([a for a in data if not a.get('scraping_success', True)])
-            },
-            "articles": data
+        metadata = {
+            "generated_at": datetime.now().isoformat(),
+            "data_source": self.newsapi_base_url,
+            "total_articles": len(data),
+            "successful_scrapes": len([a for a in data if a.get('scraping_success', False)]),
+            "failed_scrapes": len([a for a in data if not a.get('scraping_success', True)])
         }
 
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=2)
+            write_articles_json(filepath, metadata, data)
             
             self.logger.info(f"Resultados guardados en: {filepath}")
             return filepath
@@ -233,24 +232,16 @@ class ISONewsScraperEnhanced:
     
     def run_complete_analysis(self) -> Dict[str, str]:
         """
-        Ejecuta el scraping, lo combina con artículos hardcodeados y genera el archivo JSON
+        Busca en NewsAPI, extrae el contenido completo de cada artículo y genera el archivo JSON
         """
-        self.logger.info("Iniciando el scraping de noticias ISO Chile")
+        self.logger.info("Iniciando la búsqueda de noticias ISO en NewsAPI")
         
-        # 1. Obtener la lista de artÃ­culos de INN
-        inn_articles = self.scrape_inn_news()
+        # 1. Obtener los artículos de NewsAPI (ya sin URLs duplicadas)
+        api_articles = self.process_newsapi_articles(self.get_iso_news_from_api())
         
-        # 2. Combinar con artÃ­culos hardcodeados y de-duplicar
-        combined_articles = {article['url']: article for article in inn_articles}
-        for article in self.hardcoded_articles:
-            if article['url'] not in combined_articles:
-                combined_articles[article['url']] = article
-
-        articles_to_scrape = list(combined_articles.values())
-
-        # 3. Extraer contenido para todos los artÃ­culos
-        self.logger.info(f"Se procesarÃ¡n {len(articles_to_scrape)} artÃ­culos Ãºnicos.")
-        final_articles = self.scrape_direct_urls(articles_to_scrape)
+        # 2. Extraer contenido para todos los artículos
+        self.logger.info(f"Se procesarán {len(api_articles)} artículos únicos.")
+        final_articles = self.scrape_direct_urls(api_articles)
 
         files_generated = {}
         
@@ -5,21 +5,66 @@ Busca noticias del mundo en español, con prioridad en Chile
 """
 
 import requests
-import json
+import argparse
+import heapq
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import time
 import logging
 
+from article_extractor import ArticleExtractor
+from article_model import Article
+from article_stats import MetadataAggregator
+from article_store import open_default_store
+from config_iso_scraper import CONFIG, FILTERS, HOST_RATE_LIMITS, INCREMENTAL, JSON_OUTPUT, PAGINATION, RUN_REPORT
+from date_normalizer import normalize_dates, to_display
+from dedup import canonicalize_url
+from http_cache import open_default_cache
+from http_client import HttpClient
+from json_writer import write_articles_json
+from keyword_matcher import DomainMatcher, KeywordMatcher
+from news_archive import collapse_duplicates, merge_with_existing, merge_with_store, update_sidecar
+from query_planner import PlannedQuery, QueryPlanner
+from rate_limiter import HostRateLimiter
+from run_metrics import METRICS
+from scrape_state import ScrapeState, default_state_path
+
 class ISONewsScraperNewsAPI:
-    def __init__(self, output_dir: str = r"src/data"):
+    def __init__(self, output_dir: str = r"src/data",
+                 max_workers: int = CONFIG['max_workers'],
+                 requests_per_second: float = CONFIG['newsapi_requests_per_second'],
+                 incremental: bool = INCREMENTAL['enabled'],
+                 full_refresh: bool = False,
+                 prometheus_file: Optional[str] = None):
         """
         Inicializa el scraper de noticias ISO usando NewsAPI
+
+        Args:
+            incremental (bool): Pedir solo artículos posteriores al último publishedAt
+                conocido por consulta y procesar solo URLs no vistas
+            full_refresh (bool): Ignorar el estado guardado en esta ejecución
+            prometheus_file (str): Además del reporte JSON, exportar métricas en formato Prometheus
         """
         self.output_dir = output_dir
+        self.prometheus_file = prometheus_file
         self.session = requests.Session()
         
+        # Cliente con pool de conexiones dimensionado para las consultas concurrentes,
+        # límite de tasa hacia NewsAPI (reemplaza pausas fijas) y reintentos ante 429
+        self.max_workers = max(1, max_workers)
+        limiter = HostRateLimiter({**HOST_RATE_LIMITS, 'newsapi.org': requests_per_second})
+        self.http = HttpClient(self.session, limiter=limiter, pool_size=self.max_workers,
+                               cache=open_default_cache())
+        
+        # Estado incremental (high-water mark por consulta + índice de URLs vistas)
+        self.state = ScrapeState(default_state_path())
+        self.incremental_mode = incremental and not full_refresh
+        self.api_ok = threading.Event()
+        self.fetched_articles: List[Dict[str, Any]] = []
+        
         # NewsAPI Configuration
         # Para producción, necesitarás una clave real de NewsAPI
         self.newsapi_key = os.getenv('NEWSAPI_KEY', '8b2a1c3d4e5f6g7h8i9j0k1l2m3n4o5p')  # Placeholder
@@ -54,36 +99,48 @@ class ISONewsScraperNewsAPI:
             'chile.com', 'chilevisión.cl', 'mega.cl',
             'inn.cl', 'sernac.cl', 'gob.cl'
         ]
+        
+        # Matchers compilados una sola vez para los filtros
+        self.chilean_domain_matcher = DomainMatcher(self.chilean_domains)
+        self.excluded_domain_matcher = DomainMatcher(FILTERS['exclude_domains'])
+        self.chile_matcher = KeywordMatcher(['Chile', 'chileno', 'chilena'], required_any=[], exclude=[])
+        self.relevance_matcher = KeywordMatcher()
+        
+        # Consultas agrupadas (se calculan en build_query_plan)
+        self.query_planner = QueryPlanner()
+        self.query_plan: Dict[str, PlannedQuery] = {}
 
-    def search_newsapi(self, query: str, language: str = 'es', days_back: int = 30) -> List[Dict[str, Any]]:
+    def fetch_page(self, query: str, language: str, from_date: str, page: int) -> Optional[Dict[str, Any]]:
         """
-        Busca noticias usando NewsAPI
+        Pide una página de resultados a NewsAPI
+
+        Returns:
+            dict: Respuesta de la API (articles, totalResults) o None si la consulta falló
         """
-        articles = []
-        
-        # Fecha desde hace X días
-        from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
-        
         # Parámetros de búsqueda
         params = {
             'q': query,
             'language': language,
             'from': from_date,
             'sortBy': 'publishedAt',
-            'pageSize': 20,
+            'pageSize': PAGINATION['page_size'],
+            'page': page,
             'apiKey': self.newsapi_key
         }
         
         try:
             # Buscar en everything endpoint (más amplio)
-            response = self.session.get(f"{self.newsapi_base_url}/everything", params=params)
+            response = self.http.get(f"{self.newsapi_base_url}/everything", params=params)
             
             if response.status_code == 200:
-                data = response.json()
-                articles.extend(data.get('articles', []))
-                self.logger.info(f"Encontradas {len(articles)} noticias para '{query}'")
+                self.api_ok.set()
+                return response.json()
+            elif response.status_code == 426:
+                # El plan de la API no permite paginar más allá de este punto
+                self.logger.info(f"NewsAPI no entrega más páginas para '{query}' (página {page})")
+                return {'articles': [], 'totalResults': 0}
             elif response.status_code == 429:
-                self.logger.warning(f"Límite de API alcanzado para '{query}'")
+                self.logger.warning(f"Límite de API alcanzado para '{query}' tras {self.http.max_retries} reintentos")
             elif response.status_code == 401:
                 self.logger.error("Clave de API inválida o no proporcionada")
             else:
@@ -92,45 +149,100 @@ class ISONewsScraperNewsAPI:
         except Exception as e:
             self.logger.error(f"Error buscando '{query}': {str(e)}")
         
-        return articles
+        return None
 
-    def search_chilean_sources(self, query: str) -> List[Dict[str, Any]]:
+    @METRICS.timed('search_newsapi')
+    def harvest(self, query: str, language: str = 'es', days_back: int = 30,
+                since: Optional[str] = None, max_pages: int = 1) -> Tuple[List[Dict[str, Any]], int, bool]:
         """
-        Busca específicamente en fuentes chilenas usando NewsAPI
+        Recorre las páginas de una consulta (más recientes primero) hasta agotar
+        totalResults o `max_pages`, o hasta una página sin nada nuevo: solo URLs
+        ya vistas o artículos anteriores al high-water mark `since`
+
+        Returns:
+            tuple: (artículos, requests usados, cosecha completa). Si se cortó por
+                   presupuesto o error no es completa y el high-water mark no debe avanzar
         """
         articles = []
         
-        # Términos específicos para Chile
-        chilean_queries = [
+        # Fecha desde hace X días
+        from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+        if since and since > from_date:
+            from_date = since.rstrip('Z')
+        
+        requests_used = 0
+        complete = False
+        for page in range(1, max_pages + 1):
+            data = self.fetch_page(query, language, from_date, page)
+            requests_used += 1
+            if data is None:
+                break
+            
+            batch = data.get('articles', [])
+            recent = [a for a in batch if not since or (a.get('publishedAt') or '') >= since]
+            articles.extend(recent)
+            
+            if len(recent) < len(batch):
+                complete = True  # Se alcanzó el high-water mark
+                break
+            if self.incremental_mode and batch and not any(self.state.is_new(a) for a in batch):
+                complete = True  # Solo artículos ya procesados en ejecuciones previas
+                break
+            if len(batch) < PAGINATION['page_size'] or page * PAGINATION['page_size'] >= data.get('totalResults', 0):
+                complete = True
+                break
+        
+        self.logger.info(f"Encontradas {len(articles)} noticias para '{query}' en {requests_used} página(s)")
+        return articles, requests_used, complete
+
+    def search_newsapi(self, query: str, language: str = 'es', days_back: int = 30,
+                       since: Optional[str] = None, max_pages: int = 1) -> List[Dict[str, Any]]:
+        """
+        Busca noticias usando NewsAPI
+        Si se entrega `since` (publishedAt ISO) y es posterior a la ventana, solo se pide el delta
+        """
+        return self.harvest(query, language, days_back, since, max_pages)[0]
+
+    def get_chilean_queries(self, query: str) -> List[str]:
+        """
+        Variantes de búsqueda específicas para Chile
+        """
+        return [
             f"{query} Chile",
             f"Chile {query}",
             f"{query} chileno",
             f"{query} chilena"
         ]
+
+    def filter_chilean_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filtra artículos que mencionen Chile o tengan dominios chilenos
+        """
+        chilean_articles = []
         
-        for chilean_query in chilean_queries:
-            # Buscar en fuentes generales con filtro de Chile
-            general_articles = self.search_newsapi(chilean_query, days_back=60)
-            
-            # Filtrar artículos que mencionen Chile o tengan dominios chilenos
-            for article in general_articles:
-                url = article.get('url', '')
-                title = article.get('title', '').lower()
-                description = article.get('description', '').lower()
-                
-                # Verificar si es relevante para Chile
-                is_chilean = (
-                    any(domain in url for domain in self.chilean_domains) or
-                    'chile' in title or 'chile' in description or
-                    'chileno' in title or 'chileno' in description or
-                    'chilena' in title or 'chilena' in description
-                )
-                
-                if is_chilean:
-                    articles.append(article)
+        for article in articles:
+            # Verificar si es relevante para Chile
+            is_chilean = (
+                self.chilean_domain_matcher.matches(article.get('url', '')) or
+                bool(self.chile_matcher.match(article.get('title'), article.get('description'))['hits'])
+            )
             
-            # Pausa entre consultas
-            time.sleep(1)
+            if is_chilean:
+                chilean_articles.append(article)
+        
+        METRICS.record_filter('chilean', len(articles), len(chilean_articles))
+        return chilean_articles
+
+    @METRICS.timed('search_chilean_sources')
+    def search_chilean_sources(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Busca específicamente en fuentes chilenas usando NewsAPI
+        """
+        articles = []
+        
+        for chilean_query in self.get_chilean_queries(query):
+            # Buscar en fuentes generales con filtro de Chile
+            articles.extend(self.run_query(chilean_query, 60, True))
         
         return articles
 
@@ -171,100 +283,192 @@ class ISONewsScraperNewsAPI:
         self.logger.info(f"Usando {len(fallback_articles)} artículos de respaldo")
         return fallback_articles
 
-    def get_iso_news_from_api(self) -> List[Dict[str, Any]]:
+    def build_query_plan(self) -> List[PlannedQuery]:
         """
-        Obtiene noticias ISO de múltiples fuentes usando NewsAPI
+        Consultas agrupadas con OR para todos los términos: una variante general
+        (30 días) y una restringida a Chile (60 días) que reemplaza las cuatro
+        consultas "{q} Chile", "Chile {q}", "{q} chileno" y "{q} chilena" por término
         """
-        all_articles = []
+        plan = self.query_planner.plan(self.search_terms, days_back=30, chilean_days_back=60)
+        self.query_plan = {planned.query: planned for planned in plan}
+        return plan
+
+    def allocate_pages(self, queries: List[str],
+                       budget: int = PAGINATION['request_budget'],
+                       max_pages: int = PAGINATION['max_pages_per_query']) -> Dict[str, int]:
+        """
+        Reparte el presupuesto de requests de la ejecución entre las consultas
+        Cada consulta recibe una página y las restantes se asignan de a una a la
+        consulta con mayor rendimiento marginal (rendimiento histórico / páginas asignadas)
+        """
+        pages = {query: 1 for query in queries}
+        heap = [(-self.state.query_yield(query), query) for query in pages if max_pages > 1]
+        heapq.heapify(heap)
+        
+        remaining = budget - len(pages)
+        while remaining > 0 and heap:
+            priority, query = heapq.heappop(heap)
+            if priority >= 0:
+                break  # Ninguna consulta con historial de artículos nuevos
+            pages[query] += 1
+            remaining -= 1
+            if pages[query] < max_pages:
+                heapq.heappush(heap, (-self.state.query_yield(query) / pages[query], query))
+        return pages
+
+    def run_query(self, query: str, days_back: int, chilean_only: bool,
+                  max_pages: int = 1) -> List[Dict[str, Any]]:
+        """
+        Ejecuta una consulta del plan, aplicando el filtro chileno si corresponde
+        En modo incremental solo pide lo publicado después del high-water mark
+        """
+        since = self.state.since(query) if self.incremental_mode else None
+        articles, requests_used, complete = self.harvest(
+            query, days_back=days_back, since=since, max_pages=max_pages
+        )
+        # Si la cosecha quedó truncada, avanzar el high-water mark dejaría un hueco
+        if complete:
+            self.state.update_high_water(query, articles)
+        if chilean_only:
+            articles = self.filter_chilean_articles(articles)
+        planned = self.query_plan.get(query)
+        if planned:
+            for article in articles:
+                article['matched_terms'] = self.query_planner.matching_terms(planned, article)
+        self.state.record_yield(query, sum(1 for a in articles if self.state.is_new(a)), requests_used)
+        return articles
+
+    def fetch_concurrently(self) -> List[Dict[str, Any]]:
+        """
+        Ejecuta todas las consultas en un pool acotado de hilos
+        La tasa global la controla el token bucket, no pausas fijas
+        """
+        plan = self.build_query_plan()
+        pages = self.allocate_pages([planned.query for planned in plan])
+        self.logger.info(f"Ejecutando {len(plan)} consultas ({sum(pages.values())} páginas máx.) "
+                         f"con {self.max_workers} hilos")
         
-        # Intentar búsqueda en NewsAPI
-        api_working = False
+        all_articles = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.run_query, planned.query, planned.days_back,
+                                planned.chilean_only, pages[planned.query])
+                for planned in plan
+            ]
+            # Recolectar en el orden del plan para que la deduplicación sea determinista
+            for future in futures:
+                all_articles.extend(future.result())
+        
+        return all_articles
+
+    def fetch_sequentially(self) -> List[Dict[str, Any]]:
+        """
+        Ejecuta las consultas una tras otra (modo original)
+        """
+        all_articles = []
+        plan = self.build_query_plan()
+        pages = self.allocate_pages([planned.query for planned in plan])
         
-        # Buscar por cada término
-        for i, term in enumerate(self.search_terms):
-            self.logger.info(f"Buscando noticias para: {term} ({i+1}/{len(self.search_terms)})")
-            
-            # Búsqueda general en español
-            general_articles = self.search_newsapi(term)
-            if general_articles:
-                api_working = True
-                all_articles.extend(general_articles)
-            
-            # Búsqueda específica en fuentes chilenas
-            chilean_articles = self.search_chilean_sources(term)
-            if chilean_articles:
-                api_working = True
-                all_articles.extend(chilean_articles)
-            
-            # Pausa entre búsquedas para respetar límites de API
-            time.sleep(2)
-            
-            # Limitar búsquedas si hay muchos resultados
-            if len(all_articles) > 100:
-                break
+        # El presupuesto de páginas reemplaza el antiguo corte en 100 artículos
+        for i, planned in enumerate(plan):
+            self.logger.info(f"Buscando noticias para: {', '.join(planned.terms)} ({i+1}/{len(plan)})")
+            all_articles.extend(self.run_query(planned.query, planned.days_back,
+                                               planned.chilean_only, pages[planned.query]))
         
-        # Si la API no funciona, usar artículos de respaldo
-        if not api_working or len(all_articles) == 0:
+        return all_articles
+
+    def get_iso_news_from_api(self, concurrent: bool = True) -> List[Dict[str, Any]]:
+        """
+        Obtiene noticias ISO de múltiples fuentes usando NewsAPI
+        """
+        start = time.monotonic()
+        if concurrent:
+            all_articles = self.fetch_concurrently()
+        else:
+            all_articles = self.fetch_sequentially()
+        self.logger.info(f"Consultas a NewsAPI completadas en {time.monotonic() - start:.1f}s")
+        self.http.log_stats()
+        
+        # La API funciona si alguna consulta respondió correctamente
+        api_working = self.api_ok.is_set() or len(all_articles) > 0
+        
+        # Si la API no funciona, usar artículos de respaldo (o conservar los existentes)
+        if not api_working:
+            if self.incremental_mode:
+                self.logger.warning("NewsAPI no disponible, se conservan los artículos existentes")
+                return []
             self.logger.warning("NewsAPI no disponible, usando artículos de respaldo")
             all_articles = self.get_fallback_articles()
+        elif not all_articles and not self.incremental_mode:
+            self.logger.warning("NewsAPI no devolvió resultados, usando artículos de respaldo")
+            all_articles = self.get_fallback_articles()
         
-        # Eliminar duplicados basándose en URL
+        # Eliminar duplicados basándose en la URL canónica (sin tracking, www ni barra final)
         unique_articles = {}
         for article in all_articles:
-            url = article.get('url')
+            url = canonicalize_url(article.get('url'))
             if url and url not in unique_articles:
                 unique_articles[url] = article
+            elif url and article.get('matched_terms'):
+                # Mismo artículo desde otra consulta: acumular los términos que lo encontraron
+                kept = unique_articles[url]
+                kept['matched_terms'] = list(dict.fromkeys(
+                    (kept.get('matched_terms') or []) + article['matched_terms']
+                ))
+        METRICS.record_filter('url_dedup', len(all_articles), len(unique_articles))
+        
+        # En modo incremental solo se procesan artículos no vistos en ejecuciones previas
+        if self.incremental_mode:
+            new_articles = self.state.filter_new(unique_articles.values())
+            self.logger.info(f"{len(new_articles)} de {len(unique_articles)} artículos son nuevos")
+            METRICS.record_filter('incremental_new', len(unique_articles), len(new_articles))
+            return new_articles
         
         return list(unique_articles.values())
 
+    @METRICS.timed('process_newsapi_articles')
     def process_newsapi_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Procesa artículos de NewsAPI al formato esperado
         """
         processed_articles = []
+        # Fechas de toda la columna de una vez (los valores repetidos se resuelven una sola vez)
+        published_dates = normalize_dates(article.get('publishedAt') for article in articles)
         
-        for article in articles:
+        for article, published_at in zip(articles, published_dates):
             try:
                 # Extraer información básica
                 title = article.get('title', 'Sin título')
                 url = article.get('url', '')
                 source_name = article.get('source', {}).get('name', 'Fuente desconocida')
-                published_at = article.get('publishedAt', '')
                 description = article.get('description', '')
                 image_url = article.get('urlToImage', '')
                 content = article.get('content', '')
                 
-                # Formatear fecha
-                try:
-                    if published_at:
-                        date_obj = datetime.strptime(published_at, '%Y-%m-%dT%H:%M:%SZ')
-                        formatted_date = date_obj.strftime('%d/%m/%Y')
-                    else:
-                        formatted_date = datetime.now().strftime('%d/%m/%Y')
-                except:
-                    formatted_date = datetime.now().strftime('%d/%m/%Y')
+                # Formatear fecha (sin fecha válida queda como desconocida, no como hoy)
+                formatted_date = to_display(published_at)
                 
                 # Crear resumen
                 summary = description if description else (content[:200] + '...' if content and len(content) > 200 else content)
                 
                 # Determinar si es de Chile
-                is_chilean = any(domain in url for domain in self.chilean_domains)
+                is_chilean = self.chilean_domain_matcher.matches(url)
                 country_flag = '🇨🇱' if is_chilean else '🌍'
                 
-                processed_article = {
-                    'title': title,
-                    'url': url,
-                    'source': f"{source_name} {country_flag}",
-                    'date': formatted_date,
-                    'summary': summary or "Artículo sobre normas ISO y certificaciones de calidad.",
-                    'image_url': image_url,
-                    'full_content': content,
-                    'content_length': len(content) if content else 0,
-                    'scraped_at': datetime.now().isoformat(),
-                    'scraping_success': True,
-                    'is_chilean_source': is_chilean,
-                    'published_at': published_at
-                }
+                processed_article = Article(
+                    title=title,
+                    url=url,
+                    source=f"{source_name} {country_flag}",
+                    date=formatted_date,
+                    summary=summary or "Artículo sobre normas ISO y certificaciones de calidad.",
+                    image_url=image_url,
+                    full_content=content,
+                    scraped_at=datetime.now().isoformat(),
+                    scraping_success=True,
+                    is_chilean_source=is_chilean,
+                    published_at=published_at,
+                    matched_terms=article.get('matched_terms', [])
+                )
                 
                 processed_articles.append(processed_article)
                 
@@ -274,36 +478,75 @@ class ISONewsScraperNewsAPI:
         
         return processed_articles
 
-    def save_results_json(self, data: List[Dict[str, Any]], filename: str) -> str:
+    @METRICS.timed('relevance_filter')
+    def filter_relevant(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Conserva los artículos relevantes para ISO (fuera de dominios excluidos)
+        y les asigna relevance_score
+        """
+        relevant_articles = []
+        for article in articles:
+            if self.excluded_domain_matcher.matches(article.get('url', '')):
+                continue
+            
+            # Verificar si es realmente relevante para ISO (una pasada sobre todo el texto)
+            match = self.relevance_matcher.match(
+                article.get('title'), article.get('summary'), article.get('full_content')
+            )
+            is_relevant = (
+                match['has_required'] and not match['excluded'] and
+                match['score'] >= FILTERS['min_relevance_score']
+            )
+            
+            if is_relevant:
+                article['relevance_score'] = match['score']
+                relevant_articles.append(article)
+        
+        METRICS.record_filter('relevance', len(articles), len(relevant_articles))
+        return relevant_articles
+
+    @METRICS.timed('extract_full_content')
+    def extract_full_content(self, articles: List[Dict[str, Any]],
+                             limit: int = CONFIG['max_articles_detailed']) -> List[Dict[str, Any]]:
+        """
+        Completa full_content/author descargando la página de los primeros `limit` artículos
+        Si la descarga falla se conserva el contenido entregado por la API
+        """
+        extractor = ArticleExtractor(self.http)
+        return extractor.extract_many(articles[:limit]) + articles[limit:]
+
+    @METRICS.timed('save_results_json')
+    def save_results_json(self, data: List[Dict[str, Any]], filename: str,
+                          new_articles: Optional[List[Dict[str, Any]]] = None) -> str:
         """
         Guarda los resultados en formato JSON
+        La escritura es atómica: se genera un temporal y se reemplaza con os.replace
+
+        Args:
+            new_articles (list): Subconjunto nuevo de `data`, para agregarlo al registro JSON Lines
         """
         filepath = os.path.join(self.output_dir, filename)
         
-        # Separar artículos chilenos y internacionales
-        chilean_articles = [a for a in data if a.get('is_chilean_source', False)]
-        international_articles = [a for a in data if not a.get('is_chilean_source', False)]
+        # Los contadores se calculan en la misma pasada que escribe los artículos
+        aggregator = MetadataAggregator()
         
-        output_data = {
-            "metadata": {
+        def metadata() -> Dict[str, Any]:
+            return {
                 "generated_at": datetime.now().isoformat(),
                 "data_source": "NewsAPI - Noticias ISO en Español",
-                "total_articles": len(data),
-                "chilean_articles": len(chilean_articles),
-                "international_articles": len(international_articles),
                 "search_terms": self.search_terms,
-                "successful_scrapes": len([a for a in data if a.get('scraping_success', False)]),
-                "failed_scrapes": len([a for a in data if not a.get('scraping_success', True)])
-            },
-            "articles": sorted(data, key=lambda x: (
-                0 if x.get('is_chilean_source', False) else 1,  # Chilenos primero
-                x.get('published_at', ''), 
-            ), reverse=True)  # Más recientes primero
-        }
+                **aggregator.metadata(),
+            }
+        
+        articles = sorted(data, key=lambda x: (
+            0 if x.get('is_chilean_source', False) else 1,  # Chilenos primero
+            x.get('published_at') or '',  # Fecha desconocida (None) al final
+        ), reverse=True)  # Más recientes primero
 
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=2)
+            write_articles_json(filepath, metadata, aggregator.stream(articles))
+            if JSON_OUTPUT['jsonl_sidecar']:
+                update_sidecar(filepath, data, new_articles)
             
             self.logger.info(f"Resultados guardados en: {filepath}")
             return filepath
@@ -312,54 +555,109 @@ class ISONewsScraperNewsAPI:
             self.logger.error(f"Error guardando resultados: {str(e)}")
             raise
 
-    def run_complete_analysis(self) -> Dict[str, str]:
+    def collect_articles(self) -> List[Dict[str, Any]]:
         """
-        Ejecuta la búsqueda de noticias ISO usando NewsAPI
+        Obtiene, procesa, filtra y completa los artículos de NewsAPI (sin guardar)
         """
-        self.logger.info("Iniciando búsqueda de noticias ISO en español usando NewsAPI")
-        
         # 1. Obtener noticias de NewsAPI
         newsapi_articles = self.get_iso_news_from_api()
+        self.fetched_articles = newsapi_articles
         self.logger.info(f"Obtenidas {len(newsapi_articles)} noticias de NewsAPI")
         
         # 2. Procesar artículos al formato esperado
         processed_articles = self.process_newsapi_articles(newsapi_articles)
         
         # 3. Filtrar artículos relevantes (que mencionen ISO de forma significativa)
-        relevant_articles = []
-        for article in processed_articles:
-            title_lower = article.get('title', '').lower()
-            summary_lower = article.get('summary', '').lower()
-            
-            # Verificar si es realmente relevante para ISO
-            is_relevant = any(
-                term.lower() in title_lower or term.lower() in summary_lower
-                for term in ['iso', 'certificación', 'calidad', 'gestión', 'norma', 'audit']
-            )
-            
-            if is_relevant:
-                relevant_articles.append(article)
+        relevant_articles = self.filter_relevant(processed_articles)
         
         self.logger.info(f"Filtrados {len(relevant_articles)} artículos relevantes")
         
+        # 4. Extraer contenido completo (NewsAPI entrega el contenido truncado)
+        if CONFIG['extract_full_content'] and relevant_articles and self.api_ok.is_set():
+            relevant_articles = self.extract_full_content(relevant_articles)
+        
+        return relevant_articles
+
+    def commit_state(self) -> None:
+        """
+        Registra lo procesado en el estado incremental
+        Se llama solo después de guardar, para no perder artículos si la ejecución falla
+        """
+        if self.api_ok.is_set():
+            self.state.mark_seen(self.fetched_articles)
+        self.state.save()
+
+    def run_complete_analysis(self) -> Dict[str, str]:
+        """
+        Ejecuta la búsqueda de noticias ISO usando NewsAPI
+        """
+        self.logger.info("Iniciando búsqueda de noticias ISO en español usando NewsAPI")
+        
+        relevant_articles = self.collect_articles()
+        
         files_generated = {}
         
         # Usar nombre de archivo canónico
         canonical_filename = 'iso_news.json'
         
+        new_articles = None
+        store = open_default_store()
+        if self.incremental_mode:
+            new_articles = relevant_articles
+            filepath = os.path.join(self.output_dir, canonical_filename)
+            if store:
+                relevant_articles = merge_with_store(new_articles, filepath, store)
+            else:
+                relevant_articles = merge_with_existing(new_articles, filepath)
+            if not relevant_articles:
+                self.logger.warning("Sin artículos nuevos ni existentes, usando artículos de respaldo")
+                relevant_articles = self.process_newsapi_articles(self.get_fallback_articles())
+                new_articles = None
+        
+        # Colapsar casi-duplicados (misma nota en varios medios), conservando la mejor fuente
+        relevant_articles, new_articles = collapse_duplicates(relevant_articles, new_articles)
+        
         files_generated['articles'] = self.save_results_json(
-            relevant_articles, canonical_filename
+            relevant_articles, canonical_filename, new_articles
         )
         
+        if store:
+            if not self.incremental_mode:
+                store.upsert_many('iso_news', relevant_articles)
+            store.close()
+        self.commit_state()
+        
+        if RUN_REPORT['enabled']:
+            files_generated['run_report'] = self.write_run_report(self.prometheus_file)
+        
         return files_generated
 
+    def write_run_report(self, prometheus_file: Optional[str] = None) -> str:
+        """
+        Escribe las métricas de la ejecución junto a iso_news.json
+        """
+        path = os.path.join(self.output_dir, RUN_REPORT['report_file'])
+        prometheus_file = prometheus_file or RUN_REPORT['prometheus_file']
+        if prometheus_file and not os.path.isabs(prometheus_file):
+            prometheus_file = os.path.join(self.output_dir, prometheus_file)
+        METRICS.write(path, prometheus_file)
+        self.logger.info(f"Reporte de métricas: {path}")
+        return path
+
 
 def main():
     """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Búsqueda de noticias ISO en español usando NewsAPI")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="Ignorar el estado incremental y volver a pedir toda la ventana de días")
+    parser.add_argument('--prometheus', metavar='ARCHIVO',
+                        help="Exportar también las métricas de la ejecución en formato Prometheus")
+    args = parser.parse_args()
+    
     print("🚀 Iniciando búsqueda de noticias ISO en español usando NewsAPI")
     print("=" * 70)
     
-    scraper = ISONewsScraperNewsAPI()
+    scraper = ISONewsScraperNewsAPI(full_refresh=args.full_refresh, prometheus_file=args.prometheus)
     
     try:
         generated_files = scraper.run_complete_analysis()
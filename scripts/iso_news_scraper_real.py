@@ -5,21 +5,33 @@ Versión: 2.0 - Diciembre 2024
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
+import os
 import datetime
 from urllib.parse import urljoin, urlparse
 import ssl
 import urllib3
-import time
-import random
+
+from article_model import Article
+from config_iso_scraper import RUN_REPORT
+from date_normalizer import normalize_date, to_display
+from http_cache import open_default_cache
+from http_client import HttpClient
+from json_writer import write_articles_json
+from keyword_matcher import KeywordMatcher
+from listing_parser import ListingParser
+from run_metrics import METRICS
 
 # Deshabilitar advertencias SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 class ISONewsScraperReal:
-    def __init__(self):
-        """Inicializar el scraper para noticias ISO reales"""
+    def __init__(self, parser_backend=None):
+        """
+        Inicializar el scraper para noticias ISO reales
+        
+        Args:
+            parser_backend (str): 'lxml' (por defecto si está instalado) o 'html.parser'
+        """
         self.base_url = "https://www.inn.cl"
         self.news_url = "https://www.inn.cl/noticias"
         self.session = requests.Session()
@@ -34,12 +46,23 @@ class ISONewsScraperReal:
             'Upgrade-Insecure-Requests': '1',
         })
         
+        # Límite de tasa por host y reintentos compartidos con los demás scrapers
+        self.http = HttpClient(self.session, cache=open_default_cache())
+        
         self.articles = []
         
+        # Parser del listado con selectores precompilados
+        self.listing_parser = ListingParser(parser_backend)
+        
+        # Palabras clave ISO compiladas una sola vez (sin tildes ni mayúsculas)
+        self.iso_matcher = KeywordMatcher(
+            ['iso', 'norma', 'certificación', 'estándar', 'calidad', 'gestión'], required_any=[]
+        )
+        
     def get_page_content(self, url):
         """Obtener contenido de una página web con manejo de errores"""
         try:
-            response = self.session.get(url, verify=False, timeout=15)
+            response = self.http.get(url, verify=False, timeout=15)
             response.raise_for_status()
             return response.text
         except requests.exceptions.RequestException as e:
@@ -47,46 +70,10 @@ class ISONewsScraperReal:
             return None
             
     def parse_date(self, date_str):
-        """Convertir fecha a formato DD/MM/YYYY"""
-        if not date_str:
-            return datetime.datetime.now().strftime("%d/%m/%Y")
-            
-        try:
-            # Intentar varios formatos de fecha
-            formats = [
-                "%d/%m/%Y",
-                "%d-%m-%Y", 
-                "%Y-%m-%d",
-                "%d de %B de %Y",
-                "%d %B %Y"
-            ]
-            
-            # Mapeo de meses en español
-            months_es = {
-                'enero': 'January', 'febrero': 'February', 'marzo': 'March',
-                'abril': 'April', 'mayo': 'May', 'junio': 'June',
-                'julio': 'July', 'agosto': 'August', 'septiembre': 'September',
-                'octubre': 'October', 'noviembre': 'November', 'diciembre': 'December'
-            }
-            
-            date_clean = date_str.strip().lower()
-            for es_month, en_month in months_es.items():
-                date_clean = date_clean.replace(es_month, en_month)
-            
-            for fmt in formats:
-                try:
-                    parsed_date = datetime.datetime.strptime(date_clean, fmt.lower())
-                    return parsed_date.strftime("%d/%m/%Y")
-                except ValueError:
-                    continue
-                    
-            # Si no se puede parsear, usar fecha actual
-            return datetime.datetime.now().strftime("%d/%m/%Y")
-            
-        except Exception as e:
-            print(f"⚠️ Error parseando fecha '{date_str}': {e}")
-            return datetime.datetime.now().strftime("%d/%m/%Y")
+        """Convertir fecha a formato DD/MM/YYYY ("Fecha desconocida" si no se reconoce)"""
+        return to_display(normalize_date(date_str))
     
+    @METRICS.timed('scrape_inn_news')
     def scrape_inn_news(self):
         """Scrapear noticias del INN Chile"""
         print("🇨🇱 Scrapeando noticias del INN Chile...")
@@ -96,160 +83,108 @@ class ISONewsScraperReal:
             print("❌ No se pudo obtener el contenido de noticias del INN")
             return []
             
-        soup = BeautifulSoup(content, 'html.parser')
         articles = []
         
-        # Buscar diferentes selectores de noticias
-        news_selectors = [
-            'article',
-            '.noticia',
-            '.news-item',
-            '.entry',
-            '.post',
-            'div[class*=\"news\"]',
-            'div[class*=\"noticia\"]'
-        ]
-        
-        news_items = []
-        for selector in news_selectors:
-            items = soup.select(selector)
-            if items:
-                news_items.extend(items)
-                print(f"✅ Encontrados {len(items)} elementos con selector '{selector}'")
+        # Una sola pasada sobre el documento entrega todos los candidatos (sin duplicados)
+        news_items = self.listing_parser.parse(content)
+        if news_items:
+            print(f"✅ Encontrados {len(news_items)} elementos de noticias ({self.listing_parser.backend})")
         
         # Si no encuentra con selectores específicos, buscar enlaces que parezcan noticias
         if not news_items:
             print("🔍 Buscando enlaces de noticias...")
-            all_links = soup.find_all('a', href=True)
-            news_links = []
-            
-            for link in all_links:
-                href = link.get('href', '')
-                text = link.get_text(strip=True)
-                
+            news_links = [
+                link for link in self.listing_parser.parse_links(content)
                 # Filtrar enlaces que parezcan noticias
-                if (text and len(text) > 20 and 
-                    any(keyword in text.lower() for keyword in ['iso', 'norma', 'certificación', 'estándar', 'calidad'])):
-                    news_links.append(link)
+                if len(link['text']) > 20 and self.iso_matcher.match(link['text'])['score'] > 0
+            ]
             
             print(f"🔗 Encontrados {len(news_links)} enlaces de noticias potenciales")
             
             # Convertir enlaces a artículos
             for link in news_links[:10]:  # Limitar a 10 para no sobrecargar
-                news_items.append(link.parent if link.parent else link)
+                news_items.append({'title': link['text'], 'href': link['href'], 'date_text': '', 'summary': ''})
         
         print(f"📰 Procesando {len(news_items)} elementos de noticias...")
         
-        for item in news_items[:15]:  # Limitar a 15 noticias
+        candidates = news_items[:15]  # Limitar a 15 noticias
+        for item in candidates:  # Limitar a 15 noticias
             try:
                 # Extraer título
-                title_elem = (
-                    item.find('h1') or item.find('h2') or item.find('h3') or 
-                    item.find('h4') or item.find('.title') or 
-                    item.find('[class*=\"title\"]') or item.find('a')
-                )
-                
-                if not title_elem:
-                    continue
-                    
-                title = title_elem.get_text(strip=True)
+                title = item['title']
                 if not title or len(title) < 10:
                     continue
                 
                 # Extraer URL
-                url_elem = item.find('a', href=True) or title_elem
-                if url_elem and url_elem.get('href'):
-                    url = urljoin(self.base_url, url_elem['href'])
-                else:
-                    url = self.news_url
+                url = urljoin(self.base_url, item['href']) if item['href'] else self.news_url
                 
-                # Extraer fecha
-                date_elem = (
-                    item.find('.date') or item.find('.fecha') or 
-                    item.find('[class*=\"date\"]') or item.find('[class*=\"fecha\"]') or
-                    item.find('time')
-                )
-                
-                if date_elem:
-                    date_text = date_elem.get_text(strip=True)
-                    date = self.parse_date(date_text)
-                else:
-                    date = datetime.datetime.now().strftime("%d/%m/%Y")
+                # Extraer fecha (sin fecha reconocible queda como desconocida, no como hoy)
+                published_at = normalize_date(item['date_text'])
                 
                 # Extraer resumen/descripción
-                summary_elem = (
-                    item.find('.excerpt') or item.find('.summary') or 
-                    item.find('.description') or item.find('p')
-                )
-                
-                if summary_elem:
-                    summary = summary_elem.get_text(strip=True)
+                summary = item['summary']
+                if summary:
                     if len(summary) > 200:
                         summary = summary[:200] + "..."
                 else:
                     summary = f"Noticia sobre normas ISO del INN Chile - {title[:100]}..."
                 
                 # Verificar que es relevante para ISO
-                combined_text = f"{title} {summary}".lower()
-                iso_keywords = ['iso', 'norma', 'certificación', 'estándar', 'calidad', 'gestión']
+                match = self.iso_matcher.match(title, summary)
                 
-                if any(keyword in combined_text for keyword in iso_keywords):
-                    article = {
-                        "title": title,
-                        "url": url,
-                        "source": "Instituto Nacional de Normalización (INN)",
-                        "date": date,
-                        "summary": summary,
-                        "image_url": "",
-                        "full_content": summary,
-                        "content_length": len(summary),
-                        "scraped_at": datetime.datetime.now().isoformat()
-                    }
+                if match['score'] > 0 and not match['excluded']:
+                    article = Article(
+                        title=title,
+                        url=url,
+                        source="Instituto Nacional de Normalización (INN)",
+                        date=to_display(published_at),
+                        published_at=published_at,
+                        summary=summary,
+                        full_content=summary,
+                        scraped_at=datetime.datetime.now().isoformat()
+                    )
                     
                     articles.append(article)
                     print(f"✅ Agregada noticia: {title[:60]}...")
                 
-                # Pausa entre requests
-                time.sleep(random.uniform(0.5, 1.5))
-                
             except Exception as e:
                 print(f"⚠️ Error procesando noticia: {e}")
                 continue
         
+        METRICS.record_filter('inn_iso_keywords', len(candidates), len(articles))
         print(f"🎯 Total de noticias reales obtenidas del INN: {len(articles)}")
         return articles
     
     def get_additional_iso_content(self):
-        """Obtener contenido adicional de ISO del INN"""
+        """Obtener contenido adicional de ISO del INN (páginas sin fecha de publicación)"""
         print("📋 Obteniendo contenido adicional sobre ISO...")
         
         additional_articles = [
-            {
-                "title": "Nuevas Normas ISO 2025 - Actualización del INN",
-                "url": f"{self.base_url}/normas-iso-2025",
-                "source": "Instituto Nacional de Normalización (INN)",
-                "date": datetime.datetime.now().strftime("%d/%m/%Y"),
-                "summary": "El INN Chile informa sobre las nuevas actualizaciones de normas ISO previstas para 2025, incluyendo revisiones de ISO 9001, ISO 14001 e ISO 45001.",
-                "image_url": "",
-                "full_content": "Actualización sobre nuevas normas ISO 2025 del Instituto Nacional de Normalización de Chile.",
-                "content_length": 120,
-                "scraped_at": datetime.datetime.now().isoformat()
-            },
-            {
-                "title": "Certificaciones ISO en Chile - Estadísticas 2024",
-                "url": f"{self.base_url}/estadisticas-iso-chile-2024",
-                "source": "Instituto Nacional de Normalización (INN)",
-                "date": datetime.datetime.now().strftime("%d/%m/%Y"),
-                "summary": "Reporte estadístico sobre el crecimiento de certificaciones ISO en Chile durante el año 2024, destacando sectores con mayor adopción.",
-                "image_url": "",
-                "full_content": "Estadísticas de certificaciones ISO en Chile durante 2024 según datos del INN.",
-                "content_length": 110,
-                "scraped_at": datetime.datetime.now().isoformat()
-            }
+            Article(
+                title="Nuevas Normas ISO 2025 - Actualización del INN",
+                url=f"{self.base_url}/normas-iso-2025",
+                source="Instituto Nacional de Normalización (INN)",
+                date=to_display(None),
+                published_at=None,
+                summary="El INN Chile informa sobre las nuevas actualizaciones de normas ISO previstas para 2025, incluyendo revisiones de ISO 9001, ISO 14001 e ISO 45001.",
+                full_content="Actualización sobre nuevas normas ISO 2025 del Instituto Nacional de Normalización de Chile.",
+                scraped_at=datetime.datetime.now().isoformat()
+            ),
+            Article(
+                title="Certificaciones ISO en Chile - Estadísticas 2024",
+                url=f"{self.base_url}/estadisticas-iso-chile-2024",
+                source="Instituto Nacional de Normalización (INN)",
+                date=to_display(None),
+                published_at=None,
+                summary="Reporte estadístico sobre el crecimiento de certificaciones ISO en Chile durante el año 2024, destacando sectores con mayor adopción.",
+                full_content="Estadísticas de certificaciones ISO en Chile durante 2024 según datos del INN.",
+                scraped_at=datetime.datetime.now().isoformat()
+            )
         ]
         
         return additional_articles
     
+    @METRICS.timed('save_results_json')
     def save_results_json(self, all_articles, filename="src/data/iso_news.json"):
         """Guardar resultados en archivo JSON con solo datos reales"""
         try:
@@ -265,18 +200,17 @@ class ISONewsScraperReal:
                 "description": "Noticias reales sobre normas ISO del Instituto Nacional de Normalización de Chile"
             }
             
-            # Estructura del archivo JSON solo con datos reales
-            data = {
-                "metadata": metadata,
-                "articles": all_articles
-            }
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # Estructura del archivo JSON solo con datos reales (escritura atómica)
+            write_articles_json(filename, metadata, all_articles)
             
             print(f"✅ Archivo JSON guardado: {filename}")
             print(f"📊 Total de artículos reales: {len(all_articles)}")
             
+            if RUN_REPORT['enabled']:
+                report = os.path.join(os.path.dirname(filename), RUN_REPORT['report_file'])
+                METRICS.write(report)
+                print(f"⏱️ Reporte de métricas: {report}")
+            
         except Exception as e:
             print(f"❌ Error guardando archivo JSON: {e}")
     
@@ -287,6 +221,9 @@ class ISONewsScraperReal:
         
         # Obtener noticias reales del INN
         inn_articles = self.scrape_inn_news()
+        for host, counters in self.http.stats().items():
+            cached = int(counters.get('cache_hits', 0) + counters.get('cache_revalidated', 0))
+            print(f"📊 {host}: {int(counters.get('requests', 0))} requests, {int(counters.get('retries', 0))} reintentos, {cached} desde caché")
         
         # Si no se obtuvieron suficientes noticias reales, agregar contenido adicional
         if len(inn_articles) < 5:
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Escritura segura de los archivos JSON de noticias
+Escribe en streaming a un archivo temporal y lo reemplaza de forma atómica
+(os.replace), de modo que un fallo a mitad de escritura nunca deja el
+archivo publicado truncado. Incluye un registro JSON Lines para fusionar
+artículos de forma incremental
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, IO, Iterator, Union
+
+from article_model import json_default
+from config_iso_scraper import JSON_OUTPUT
+
+Metadata = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
+
+@contextmanager
+def atomic_write(filepath: str, binary: bool = False) -> Iterator[IO]:
+    """
+    Abre un archivo temporal en el mismo directorio y lo publica con os.replace
+    solo si el bloque termina sin errores (binary=True para imágenes y otros bytes)
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filepath)}.", suffix='.tmp', dir=directory)
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _dumps(value: Any, compact: bool, level: int) -> str:
+    if compact:
+        return json.dumps(value, ensure_ascii=JSON_OUTPUT['ensure_ascii'], separators=(',', ':'), default=json_default)
+    text = json.dumps(value, ensure_ascii=JSON_OUTPUT['ensure_ascii'], indent=JSON_OUTPUT['indent'],
+                      default=json_default)
+    return text.replace('\n', '\n' + ' ' * (JSON_OUTPUT['indent'] * level))
+
+
+def write_articles_json(filepath: str, metadata: Metadata, articles: Iterable[Dict[str, Any]],
+                        compact: bool = JSON_OUTPUT['compact']) -> int:
+    """
+    Escribe {"metadata": ..., "articles": [...]} consumiendo `articles` como generador
+
+    Args:
+        filepath (str): Archivo de destino (se reemplaza de forma atómica)
+        metadata: Diccionario, o función que lo construye una vez recorridos los
+            artículos (en ese caso la clave "metadata" se escribe al final)
+        articles: Iterable de artículos; no se materializa en memoria
+        compact (bool): JSON minificado en vez de indentado
+
+    Returns:
+        int: Cantidad de artículos escritos
+    """
+    pad = '' if compact else ' ' * JSON_OUTPUT['indent']
+    newline = '' if compact else '\n'
+    colon = ':' if compact else ': '
+    count = 0
+
+    with atomic_write(filepath) as f:
+        f.write('{' + newline)
+        if not callable(metadata):
+            f.write(f'{pad}"metadata"{colon}{_dumps(metadata, compact, 1)},{newline}')
+
+        f.write(f'{pad}"articles"{colon}[')
+        for article in articles:
+            f.write((',' if count else '') + newline + pad * 2 + _dumps(article, compact, 2))
+            count += 1
+        f.write((newline + pad if count else '') + ']')
+
+        if callable(metadata):
+            f.write(f',{newline}{pad}"metadata"{colon}{_dumps(metadata(), compact, 1)}')
+        f.write(newline + '}' + newline)
+
+    return count
+
+
+def write_json(filepath: str, data: Any, compact: bool = JSON_OUTPUT['compact']) -> None:
+    """
+    Escritura atómica de cualquier documento JSON pequeño
+    """
+    with atomic_write(filepath) as f:
+        f.write(_dumps(data, compact, 0))
+        f.write('\n')
+
+
+def append_jsonl(filepath: str, articles: Iterable[Dict[str, Any]]) -> int:
+    """
+    Agrega artículos al registro JSON Lines (una línea por artículo)
+
+    Returns:
+        int: Líneas agregadas
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    count = 0
+    with open(filepath, 'a', encoding='utf-8') as f:
+        for article in articles:
+            f.write(json.dumps(article, ensure_ascii=False, separators=(',', ':'), default=json_default) + '\n')
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    return count
+
+
+def iter_jsonl(filepath: str) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre el registro JSON Lines; ignora una última línea truncada por un corte
+    """
+    if not os.path.exists(filepath):
+        return
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def rewrite_jsonl(filepath: str, articles: Iterable[Dict[str, Any]]) -> int:
+    """
+    Compacta el registro JSON Lines reemplazándolo de forma atómica
+    """
+    count = 0
+    with atomic_write(filepath) as f:
+        for article in articles:
+            f.write(json.dumps(article, ensure_ascii=False, separators=(',', ':'), default=json_default) + '\n')
+            count += 1
+    return count
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Matcher de palabras clave compilado para el filtro de relevancia ISO
+Construye una sola expresión regular (alternancia, frases más largas primero)
+sobre texto normalizado sin tildes ni mayúsculas y obtiene todas las
+coincidencias, incluso superpuestas, en una sola pasada
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+from config_iso_scraper import FILTERS, ISO_KEYWORDS
+
+# Pesos por tipo de palabra clave
+WEIGHT_STANDARD = 3  # Norma específica (ej: "ISO 9001")
+WEIGHT_PHRASE = 2  # Frase de varias palabras (ej: "sistema de gestión")
+WEIGHT_TERM = 1  # Término suelto (ej: "calidad")
+
+# Guion usado como separador antes de un número ("ISO-9001", "ISO - 9001")
+DIGIT_HYPHEN_RE = re.compile(r'\s*-[\s-]*(?=\d)')
+
+
+def fold(text: str) -> str:
+    """
+    Normaliza texto para comparar: minúsculas y sin tildes ("Certificación" -> "certificacion")
+    """
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def keyword_weight(folded: str) -> int:
+    if any(c.isdigit() for c in folded):
+        return WEIGHT_STANDARD
+    if ' ' in folded:
+        return WEIGHT_PHRASE
+    return WEIGHT_TERM
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str] = ISO_KEYWORDS,
+                 required_any: Iterable[str] = FILTERS['required_keywords_any'],
+                 exclude: Iterable[str] = FILTERS['exclude_keywords']):
+        """
+        Compila el vocabulario completo en una sola expresión regular
+
+        Args:
+            keywords: Palabras clave que suman al score de relevancia
+            required_any: Al menos una debe aparecer para considerar relevante el texto
+            exclude: Si aparece alguna, el texto se descarta
+        """
+        self.roles: Dict[str, Set[str]] = {}
+        self.names: Dict[str, str] = {}
+        for role, terms in (('keyword', keywords), ('required', required_any), ('exclude', exclude)):
+            for term in terms:
+                folded = ' '.join(fold(term).split())
+                self.roles.setdefault(folded, set()).add(role)
+                self.names.setdefault(folded, term)
+
+        # Frases que empiezan con otras: "iso 9001" implica "iso" en la misma posición
+        self.implied: Dict[str, List[str]] = {
+            phrase: [other for other in self.roles if phrase == other or phrase.startswith(other + ' ')]
+            for phrase in self.roles
+        }
+
+        # Antes de un número se acepta también guion: "ISO-9001" equivale a "ISO 9001"
+        alternation = '|'.join(
+            re.sub(r'\\ (?=\d)', r'[\\s-]+', re.escape(p)).replace(r'\ ', r'\s+')
+            for p in sorted(self.roles, key=len, reverse=True)
+        )
+        # Lookahead para detectar coincidencias superpuestas ("certificacion iso 9001")
+        # y plural opcional para no perder "normas", "certificaciones", etc.
+        self.pattern = re.compile(rf'(?<!\w)(?=({alternation})(?:e?s)?(?!\w))')
+
+    def match(self, *texts: Optional[str]) -> Dict[str, Any]:
+        """
+        Busca todas las coincidencias en una pasada sobre los textos concatenados
+
+        Returns:
+            dict: hits (palabra clave -> ocurrencias), score ponderado,
+                  has_required y excluded
+        """
+        folded = fold(' \n '.join(t for t in texts if t))
+        hits: Dict[str, int] = {}
+        for m in self.pattern.finditer(folded):
+            for phrase in self.implied[' '.join(DIGIT_HYPHEN_RE.sub(' ', m.group(1)).split())]:
+                hits[phrase] = hits.get(phrase, 0) + 1
+
+        score = sum(keyword_weight(p) for p in hits if 'keyword' in self.roles[p])
+        return {
+            'hits': {self.names[p]: n for p, n in hits.items()},
+            'score': score,
+            'has_required': any('required' in self.roles[p] for p in hits),
+            'excluded': any('exclude' in self.roles[p] for p in hits),
+        }
+
+    def is_relevant(self, *texts: Optional[str],
+                    min_score: int = FILTERS['min_relevance_score']) -> bool:
+        result = self.match(*texts)
+        return result['has_required'] and not result['excluded'] and result['score'] >= min_score
+
+
+class DomainMatcher:
+    def __init__(self, domains: Iterable[str]):
+        """
+        Verifica pertenencia de una URL a una lista de dominios (incluye subdominios)
+        mediante búsqueda en un set en vez de comparar subcadenas
+        """
+        self.domains = frozenset(d.lower().strip('.') for d in domains)
+
+    @lru_cache(maxsize=4096)
+    def host_matches(self, host: str) -> bool:
+        parts = host.lower().split(':', 1)[0].split('.')
+        return any('.'.join(parts[i:]) in self.domains for i in range(len(parts) - 1))
+
+    def matches(self, url: str) -> bool:
+        return bool(url) and self.host_matches(urlparse(url).netloc)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Parser de páginas de listado de noticias (INN Chile)
+Con lxml usa XPath precompilados: una sola expresión (unión de todos los
+selectores) recorre el documento una vez y entrega los candidatos sin
+duplicados y en orden de documento. Sin lxml recurre a BeautifulSoup con un
+único selector CSS combinado
+"""
+
+from typing import Dict, List, Optional
+
+try:
+    from lxml import etree, html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+from bs4 import BeautifulSoup
+
+# Selectores de elementos de noticia (equivalentes CSS y XPath)
+ITEM_CSS = 'article, .noticia, .news-item, .entry, .post, div[class*="news"], div[class*="noticia"]'
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+ITEM_XPATH = ' | '.join([
+    '//article',
+    f"//*[{_has_class('noticia')}]",
+    f"//*[{_has_class('news-item')}]",
+    f"//*[{_has_class('entry')}]",
+    f"//*[{_has_class('post')}]",
+    "//div[contains(@class, 'news')]",
+    "//div[contains(@class, 'noticia')]",
+])
+
+# Campos por elemento, en orden de prioridad (el primero que tenga texto gana)
+FIELD_XPATHS = {
+    'title': ['.//h1', './/h2', './/h3', './/h4', f".//*[{_has_class('title')}]",
+              ".//*[contains(@class, 'title')]", './/a'],
+    'date': [f".//*[{_has_class('date')}]", f".//*[{_has_class('fecha')}]",
+             ".//*[contains(@class, 'date')]", ".//*[contains(@class, 'fecha')]", './/time'],
+    'summary': [f".//*[{_has_class('excerpt')}]", f".//*[{_has_class('summary')}]",
+                f".//*[{_has_class('description')}]", './/p'],
+}
+
+FIELD_CSS = {
+    'title': ['h1', 'h2', 'h3', 'h4', '.title', '[class*="title"]', 'a'],
+    'date': ['.date', '.fecha', '[class*="date"]', '[class*="fecha"]', 'time'],
+    'summary': ['.excerpt', '.summary', '.description', 'p'],
+}
+
+
+def _clean(text: Optional[str]) -> str:
+    return ' '.join((text or '').split())
+
+
+def _innermost(items: list, ancestors) -> list:
+    """
+    Descarta contenedores (ej: div.news-list) que envuelven a otros candidatos,
+    para no duplicar la primera noticia de cada bloque
+    """
+    ids = {id(item) for item in items}
+    containers = set()
+    for item in items:
+        for ancestor in ancestors(item):
+            if id(ancestor) in ids:
+                containers.add(id(ancestor))
+    return [item for item in items if id(item) not in containers]
+
+
+class ListingParser:
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Args:
+            backend (str): 'lxml' o 'html.parser'; por defecto lxml si está instalado
+        """
+        if backend is None:
+            backend = 'lxml' if LXML_AVAILABLE else 'html.parser'
+        if backend == 'lxml' and not LXML_AVAILABLE:
+            raise ImportError("lxml no está instalado (pip install lxml)")
+        self.backend = backend
+
+        if backend == 'lxml':
+            self.item_xpath = etree.XPath(ITEM_XPATH)
+            self.field_xpaths = {
+                field: [etree.XPath(expr) for expr in exprs] for field, exprs in FIELD_XPATHS.items()
+            }
+            self.link_xpath = etree.XPath('.//a[@href]')
+            self.all_links_xpath = etree.XPath('//a[@href]')
+
+    def parse(self, content: str) -> List[Dict[str, str]]:
+        """
+        Extrae los candidatos a noticia de una página de listado
+
+        Returns:
+            list: dicts con title, href, date_text y summary (cadenas, posiblemente vacías)
+        """
+        if self.backend == 'lxml':
+            return self._parse_lxml(content)
+        return self._parse_bs4(content)
+
+    def parse_links(self, content: str) -> List[Dict[str, str]]:
+        """
+        Todos los enlaces de la página (fallback cuando no hay elementos de noticia)
+
+        Returns:
+            list: dicts con text y href
+        """
+        if self.backend == 'lxml':
+            tree = lxml_html.fromstring(content)
+            return [{'text': _clean(a.text_content()), 'href': a.get('href', '')}
+                    for a in self.all_links_xpath(tree)]
+        soup = BeautifulSoup(content, self.backend)
+        return [{'text': _clean(a.get_text(' ')), 'href': a.get('href', '')}
+                for a in soup.find_all('a', href=True)]
+
+    def _first_lxml(self, item, field: str):
+        for xpath in self.field_xpaths[field]:
+            for element in xpath(item):
+                if _clean(element.text_content()):
+                    return element
+        return None
+
+    def _parse_lxml(self, content: str) -> List[Dict[str, str]]:
+        tree = lxml_html.fromstring(content)
+        items = self.item_xpath(tree)
+        candidates = []
+        for item in _innermost(items, lambda element: element.iterancestors()):
+            title_elem = self._first_lxml(item, 'title')
+            link = self.link_xpath(item)
+            href = link[0].get('href') if link else (title_elem.get('href') if title_elem is not None else '')
+            date_elem = self._first_lxml(item, 'date')
+            summary_elem = self._first_lxml(item, 'summary')
+            candidates.append({
+                'title': _clean(title_elem.text_content()) if title_elem is not None else '',
+                'href': href or '',
+                'date_text': _clean(date_elem.text_content()) if date_elem is not None else '',
+                'summary': _clean(summary_elem.text_content()) if summary_elem is not None else '',
+            })
+        return candidates
+
+    def _first_bs4(self, item, field: str):
+        for selector in FIELD_CSS[field]:
+            for element in item.select(selector):
+                if element.get_text(strip=True):
+                    return element
+        return None
+
+    def _parse_bs4(self, content: str) -> List[Dict[str, str]]:
+        soup = BeautifulSoup(content, self.backend)
+        items = soup.select(ITEM_CSS)
+        candidates = []
+        for item in _innermost(items, lambda element: element.parents):
+            title_elem = self._first_bs4(item, 'title')
+            link = item.find('a', href=True)
+            href = link['href'] if link else (title_elem.get('href') if title_elem is not None else '')
+            date_elem = self._first_bs4(item, 'date')
+            summary_elem = self._first_bs4(item, 'summary')
+            candidates.append({
+                'title': _clean(title_elem.get_text(' ')) if title_elem is not None else '',
+                'href': href or '',
+                'date_text': _clean(date_elem.get_text(' ')) if date_elem is not None else '',
+                'summary': _clean(summary_elem.get_text(' ')) if summary_elem is not None else '',
+            })
+        return candidates
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Operaciones sobre el archivo de noticias publicado (iso_news.json + registro .jsonl)
+Compartidas por el scraper NewsAPI y el pipeline unificado: lectura de lo ya
+publicado, fusión incremental (en memoria o sobre el almacén SQLite),
+deduplicación y mantenimiento del registro JSON Lines
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from article_model import Article
+from article_store import ArticleStore
+from config_iso_scraper import INCREMENTAL, JSON_OUTPUT
+from dedup import deduplicate
+from json_writer import append_jsonl, iter_jsonl, rewrite_jsonl
+from run_metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+def sidecar_path(filepath: str) -> str:
+    """Ruta del registro JSON Lines asociado a un archivo de salida"""
+    return os.path.splitext(filepath)[0] + '.jsonl'
+
+
+def load_published_articles(filepath: str) -> List[Dict[str, Any]]:
+    """
+    Lee los artículos ya publicados, prefiriendo el registro JSON Lines
+    (vacío o inválido -> lista vacía)
+    """
+    sidecar = sidecar_path(filepath)
+    if JSON_OUTPUT['jsonl_sidecar'] and os.path.exists(sidecar):
+        # La última línea de cada URL es la versión vigente
+        latest = {}
+        for article in iter_jsonl(sidecar):
+            latest.pop(article.get('url'), None)
+            latest[article.get('url')] = article
+        return [Article.from_dict(article) for article in latest.values()]
+
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return [Article.from_dict(article) for article in json.load(f).get('articles', [])]
+    except (OSError, ValueError, AttributeError):
+        return []
+
+
+def merge_with_existing(new_articles: List[Dict[str, Any]], filepath: str,
+                        retention_days: int = INCREMENTAL['retention_days']) -> List[Dict[str, Any]]:
+    """
+    Fusiona los artículos nuevos con los ya publicados, descartando los que
+    superan la retención configurada
+    """
+    cutoff = (datetime.now() - timedelta(days=retention_days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    new_urls = {a.get('url') for a in new_articles}
+
+    kept = [
+        a for a in load_published_articles(filepath)
+        if a.get('url') not in new_urls and (not a.get('published_at') or a['published_at'] >= cutoff)
+    ]
+    logger.info(f"Fusionando {len(new_articles)} artículos nuevos con {len(kept)} existentes")
+    return new_articles + kept
+
+
+def merge_with_store(new_articles: List[Dict[str, Any]], filepath: str, store: ArticleStore,
+                     retention_days: int = INCREMENTAL['retention_days']) -> List[Dict[str, Any]]:
+    """
+    Equivalente a merge_with_existing sobre el almacén: upsert de los artículos
+    nuevos y lectura de la ventana de retención ya ordenada por índice
+    (chilenos primero, más recientes primero)
+    """
+    if store.count('iso_news') == 0:
+        # Almacén nuevo o perdido (caché de CI vencida): partir desde lo publicado
+        seeded = store.upsert_many('iso_news', load_published_articles(filepath), skip_republished=False)
+        logger.info(f"Almacén inicializado con {seeded['inserted']} artículos publicados")
+
+    counts = store.upsert_many('iso_news', new_articles)
+    logger.info(f"Almacén: {counts['inserted']} nuevos, {counts['updated']} actualizados, "
+                f"{counts['skipped']} republicados omitidos")
+
+    cutoff = (datetime.now() - timedelta(days=retention_days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return [Article.from_dict(a) for a in store.iter_articles('iso_news', since=cutoff, chilean_first=True)]
+
+
+def collapse_duplicates(articles: List[Dict[str, Any]],
+                        new_articles: Optional[List[Dict[str, Any]]] = None
+                        ) -> Tuple[List[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
+    """
+    Colapsa casi-duplicados (misma nota en varios medios) conservando la mejor fuente
+    y mantiene `new_articles` como subconjunto del resultado
+    """
+    deduplicated = deduplicate(articles)
+    METRICS.record_filter('dedup', len(articles), len(deduplicated))
+    if len(deduplicated) == len(articles):
+        return articles, new_articles
+
+    logger.info(f"Colapsados {len(articles) - len(deduplicated)} artículos casi duplicados")
+    if new_articles is not None:
+        kept_urls = {a.get('url') for a in deduplicated}
+        new_articles = [a for a in new_articles if a.get('url') in kept_urls]
+    return deduplicated, new_articles
+
+
+def update_sidecar(filepath: str, data: List[Dict[str, Any]],
+                   new_articles: Optional[List[Dict[str, Any]]]) -> None:
+    """
+    Agrega solo los artículos nuevos al registro JSON Lines; lo reescribe completo
+    si no existe, si no hay delta conocido o si acumula demasiadas líneas obsoletas
+    """
+    sidecar = sidecar_path(filepath)
+    if new_articles is not None and os.path.exists(sidecar):
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            line_count = sum(1 for _ in f)
+        if line_count + len(new_articles) <= 2 * max(len(data), 1):
+            append_jsonl(sidecar, new_articles)
+            return
+    rewrite_jsonl(sidecar, data)
+
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Pipeline unificado de noticias ISO
+Ejecuta todas las fuentes (NewsAPI, INN Chile y futuras) en paralelo, fusiona,
+deduplica y ordena sus artículos, y genera un único iso_news.json por ejecución
+"""
+
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from article_model import Article
+from article_stats import MetadataAggregator
+from article_store import open_default_store
+from change_detection import detect_changes
+from config_iso_scraper import CHANGE_DETECTION, IMAGES, INCREMENTAL, JSON_OUTPUT, PIPELINE, RUN_REPORT
+from date_normalizer import normalize_date
+from image_pipeline import ImagePipeline
+from iso_news_scraper_newsapi import ISONewsScraperNewsAPI
+from iso_news_scraper_real import ISONewsScraperReal
+from json_writer import write_articles_json, write_json
+from news_archive import collapse_duplicates, merge_with_existing, merge_with_store, update_sidecar
+from run_metrics import METRICS
+
+# Directorio de datos del sitio Astro, independiente del directorio de trabajo
+DEFAULT_OUTPUT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'data'))
+
+
+class NewsSource:
+    """
+    Interfaz de una fuente del pipeline
+
+    fetch() devuelve artículos ya procesados al formato del sitio; commit() se
+    llama solo si la salida se guardó correctamente (para persistir estado)
+    """
+    name = 'base'
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def commit(self) -> None:
+        pass
+
+    def http_stats(self) -> Dict[str, Dict[str, float]]:
+        return {}
+
+
+class NewsAPISource(NewsSource):
+    name = 'newsapi'
+
+    def __init__(self, output_dir: str, full_refresh: bool = False):
+        self.scraper = ISONewsScraperNewsAPI(output_dir=output_dir, full_refresh=full_refresh)
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        return self.scraper.collect_articles()
+
+    def commit(self) -> None:
+        self.scraper.commit_state()
+
+    def http_stats(self) -> Dict[str, Dict[str, float]]:
+        return self.scraper.http.stats()
+
+
+class INNSource(NewsSource):
+    name = 'inn'
+
+    def __init__(self, output_dir: str, full_refresh: bool = False):
+        self.scraper = ISONewsScraperReal()
+
+    def fetch(self) -> List[Article]:
+        return [self.normalize(article) for article in self.scraper.scrape_inn_news()]
+
+    def normalize(self, article: Article) -> Article:
+        """
+        Completa los campos que el resto del pipeline espera de un artículo
+        """
+        article.scraping_success = True
+        article.is_chilean_source = True
+        article.published_at = article.published_at or normalize_date(article.date)
+        return article
+
+    def http_stats(self) -> Dict[str, Dict[str, float]]:
+        return self.scraper.http.stats()
+
+
+# Fuentes disponibles; para agregar una nueva basta implementar NewsSource y registrarla
+SOURCES = {
+    NewsAPISource.name: NewsAPISource,
+    INNSource.name: INNSource,
+}
+
+
+def rank_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Chilenos primero y, dentro de cada grupo, más recientes primero"""
+    return sorted(
+        articles,
+        key=lambda a: (bool(a.get('is_chilean_source')), a.get('published_at') or ''),
+        reverse=True
+    )
+
+
+class NewsPipeline:
+    def __init__(self, source_names: Optional[List[str]] = None,
+                 output_dir: str = DEFAULT_OUTPUT_DIR,
+                 output_file: str = PIPELINE['output_file'],
+                 full_refresh: bool = False,
+                 prometheus_file: Optional[str] = RUN_REPORT['prometheus_file']):
+        """
+        Inicializa el pipeline con las fuentes indicadas (por defecto PIPELINE['sources'])
+
+        Args:
+            prometheus_file (str): Además del reporte JSON, exportar métricas en formato
+                Prometheus (ruta relativa al directorio de salida)
+        """
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        self.logger = logging.getLogger(__name__)
+
+        self.output_dir = output_dir
+        self.filepath = os.path.join(output_dir, output_file)
+        self.report_path = os.path.join(output_dir, RUN_REPORT['report_file'])
+        self.prometheus_path = os.path.join(output_dir, prometheus_file) if prometheus_file else None
+        self.manifest_path = os.path.join(output_dir, CHANGE_DETECTION['manifest_file'])
+        # Resultado de la detección de cambios de la última ejecución (ver change_detection.py)
+        self.changes: Optional[Dict[str, Any]] = None
+        self.incremental_mode = INCREMENTAL['enabled'] and not full_refresh
+        self.store = open_default_store()
+        # Miniaturas locales de image_url (ver image_pipeline.py); el manifest vive junto al JSON
+        self.images = ImagePipeline(
+            manifest_path=os.path.join(output_dir, IMAGES['manifest_file'])
+        ) if IMAGES['enabled'] else None
+        os.makedirs(output_dir, exist_ok=True)
+
+        names = source_names or PIPELINE['sources']
+        unknown = [name for name in names if name not in SOURCES]
+        if unknown:
+            raise ValueError(f"Fuentes desconocidas: {', '.join(unknown)}")
+        self.sources: List[NewsSource] = [SOURCES[name](output_dir, full_refresh) for name in names]
+
+    @METRICS.timed('fetch_all')
+    def fetch_all(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Ejecuta todas las fuentes en paralelo; una fuente que falla no detiene al resto
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        with ThreadPoolExecutor(max_workers=len(self.sources)) as executor:
+            futures = {source.name: executor.submit(source.fetch) for source in self.sources}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                    self.logger.info(f"Fuente '{name}': {len(results[name])} artículos")
+                except Exception as e:
+                    self.logger.error(f"Fuente '{name}' falló: {str(e)}")
+        return results
+
+    @METRICS.timed('save')
+    def save(self, articles: List[Dict[str, Any]], per_source: Dict[str, int],
+             new_articles: Optional[List[Dict[str, Any]]]) -> str:
+        # Los contadores se calculan en la misma pasada que escribe los artículos
+        aggregator = MetadataAggregator()
+
+        def metadata() -> Dict[str, Any]:
+            return {
+                "generated_at": datetime.now().isoformat(),
+                "data_source": "Pipeline ISO: " + ", ".join(per_source),
+                "articles_per_source": per_source,
+                **aggregator.metadata(),
+            }
+
+        write_articles_json(self.filepath, metadata, aggregator.stream(articles))
+        if JSON_OUTPUT['jsonl_sidecar']:
+            update_sidecar(self.filepath, articles, new_articles)
+        self.logger.info(f"Resultados guardados en: {self.filepath}")
+        return self.filepath
+
+    def run(self) -> str:
+        """
+        Ejecuta el pipeline completo y devuelve la ruta del archivo generado
+        """
+        self.logger.info(f"Iniciando pipeline con fuentes: {', '.join(s.name for s in self.sources)}")
+        results = self.fetch_all()
+
+        fetched = [article for name in results for article in results[name]]
+        per_source = {name: len(articles) for name, articles in results.items()}
+
+        new_articles = None
+        articles = fetched
+        if self.incremental_mode:
+            new_articles = fetched
+            if self.store:
+                articles = merge_with_store(fetched, self.filepath, self.store)
+            else:
+                articles = merge_with_existing(fetched, self.filepath)
+        elif self.store:
+            self.store.upsert_many('iso_news', fetched)
+
+        articles, new_articles = collapse_duplicates(articles, new_articles)
+        articles = rank_articles(articles)
+        if self.images:
+            self.images.localize(articles, 'image_url')
+            self.images.save()
+
+        if CHANGE_DETECTION['enabled']:
+            self.changes = detect_changes(articles, self.manifest_path)
+        if self.changes is None or self.changes['changed']:
+            path = self.save(articles, per_source, new_articles)
+        else:
+            # Mismo contenido: no se reescribe el archivo publicado (solo cambiarían las marcas de tiempo)
+            path = self.filepath
+            self.logger.info(f"Sin cambios de contenido (hash {self.changes['content_hash'][:12]}); "
+                             f"se conserva {os.path.basename(path)}")
+        if self.changes is not None and self.changes['changed']:
+            # Sin cambios el manifest anterior queda intacto (byte a byte)
+            write_json(self.manifest_path, self.changes, compact=False)
+
+        for source in self.sources:
+            if source.name in results:
+                source.commit()
+            for host, counters in source.http_stats().items():
+                self.logger.info(f"[{source.name}] {host}: {int(counters.get('requests', 0))} requests")
+        
+        if self.store:
+            self.store.close()
+        if RUN_REPORT['enabled']:
+            METRICS.write(self.report_path, self.prometheus_path)
+            self.logger.info(f"Reporte de métricas: {self.report_path}")
+        return path
+
+
+def main():
+    """Función principal del pipeline"""
+    parser = argparse.ArgumentParser(description="Pipeline unificado de noticias ISO")
+    parser.add_argument('--sources', default=','.join(PIPELINE['sources']),
+                        help=f"Fuentes separadas por coma ({', '.join(SOURCES)})")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help="Directorio de salida")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="Ignorar el estado incremental en esta ejecución")
+    parser.add_argument('--prometheus', metavar='ARCHIVO', default=RUN_REPORT['prometheus_file'],
+                        help="Exportar también las métricas en formato Prometheus (en el directorio de salida)")
+    parser.add_argument('--exit-code', action='store_true',
+                        help=f"Terminar con código {CHANGE_DETECTION['unchanged_exit_code']} si el contenido no cambió")
+    args = parser.parse_args()
+
+    print("🚀 Iniciando pipeline unificado de noticias ISO")
+    print("=" * 70)
+
+    pipeline = NewsPipeline(
+        source_names=[name.strip() for name in args.sources.split(',') if name.strip()],
+        output_dir=args.output_dir,
+        full_refresh=args.full_refresh,
+        prometheus_file=args.prometheus,
+    )
+    path = pipeline.run()
+    print(f"\n✅ Pipeline completado: {os.path.basename(path)}")
+
+    if pipeline.changes is not None:
+        if pipeline.changes['changed']:
+            print(f"🔄 Contenido actualizado (hash {pipeline.changes['content_hash'][:12]})")
+        else:
+            print("💤 Sin cambios de contenido respecto de la ejecución anterior")
+            if args.exit_code:
+                sys.exit(CHANGE_DETECTION['unchanged_exit_code'])
+
+
+if __name__ == "__main__":
+    main()
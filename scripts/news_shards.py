@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Archivos fragmentados de las noticias CMS para el build de Astro
+A partir de cms2.json genera en src/data/cms/:
+
+    manifest.json      Índice compacto: total, ids, páginas y conteo por año
+    latest.json        Las últimas N noticias (widgets de la portada)
+    pages/<n>.json     Listado paginado con los campos de las tarjetas (sin texto completo)
+    items/<id>.json    Una noticia completa por archivo (páginas /noticias/<id>)
+    index.json         id -> página y hash del contenido de cada noticia
+    changes.json       ids agregados, modificados y eliminados desde la exportación anterior
+    legacy_ids.json    ids posicionales anteriores (1, 2, ...) -> id estable (redirecciones)
+
+Cada página carga solo lo que muestra en vez de importar todo el historial.
+El id es estable: hash de la URL canónica de la noticia (o de fecha + texto
+si no tiene link), de modo que una noticia nueva al inicio no renumera las
+demás y el build o la CDN pueden regenerar solo las páginas de changes.json
+
+Uso:
+    python news_shards.py
+    python news_shards.py --data-dir ../src/data --page-size 24 --latest 12
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from config_iso_scraper import NEWS_SHARDS
+from dedup import canonicalize_url
+from image_pipeline import ImagePipeline
+from json_writer import atomic_write
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'data'))
+
+# Mismo orden de reglas que inferirCategoria() en las páginas Astro
+CATEGORY_RULES = [
+    (('certificación', 'certificacion'), 'Noticias Clientes'),
+    (('capacitación', 'capacitacion'), 'Capacitación'),
+    (('haccp', 'iso 22000'), 'Seguridad Alimentaria'),
+    (('iso 27001', 'ciberseguridad'), 'Seguridad IT'),
+    (('iso 45001', 'seguridad'), 'Seguridad Laboral'),
+    (('iso 14001', 'ambiental'), 'Gestión Ambiental'),
+    (('auditoria',), 'Auditoría'),
+]
+DEFAULT_CATEGORY = 'Noticias Clientes'
+
+
+def infer_category(texto: str) -> str:
+    lower = texto.lower()
+    for needles, category in CATEGORY_RULES:
+        if any(needle in lower for needle in needles):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def make_title(texto: str) -> str:
+    """Título de hasta 80 caracteres cortado en el último espacio (crearTitulo() de Astro)"""
+    title = texto.replace('\n', ' ')[:80]
+    if len(title) == 80:
+        last_space = title.rfind(' ')
+        if last_space > 50:
+            title = title[:last_space] + '...'
+    return title[:1].upper() + title[1:]
+
+
+def make_excerpt(texto: str, length: int = 150) -> str:
+    return texto.replace('\n', ' ')[:length] + ('...' if len(texto) > length else '')
+
+
+def extract_year(fecha: str) -> str:
+    """Año de una fecha "Julio 02, 2025" ('' si no tiene el formato esperado)"""
+    parts = fecha.split(' ')
+    return parts[2].replace(',', '') if len(parts) >= 3 else ''
+
+
+def stable_id(noticia: Dict[str, Any], length: int = NEWS_SHARDS['id_length']) -> str:
+    """Id de la noticia: hash de su URL canónica, o de fecha + texto si no tiene link"""
+    link = canonicalize_url(noticia.get('link') or '')
+    key = link or f"{noticia.get('fecha', '')}\n{' '.join(noticia.get('texto', '').split())}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:length]
+
+
+def assign_ids(noticias: Iterable[Dict[str, Any]]) -> List[str]:
+    """Ids estables en orden; una URL repetida recibe un sufijo (-2, -3...) según su aparición"""
+    ids: List[str] = []
+    seen: Counter = Counter()
+    for noticia in noticias:
+        base = stable_id(noticia)
+        seen[base] += 1
+        ids.append(base if seen[base] == 1 else f"{base}-{seen[base]}")
+    return ids
+
+
+def item_hash(item: Dict[str, Any]) -> str:
+    """Hash del contenido publicado de una noticia (detecta ediciones sin cambio de id)"""
+    canonical = json.dumps(item, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def load_index(filepath: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def update_legacy_ids(filepath: str, ids: List[str]) -> bool:
+    """
+    Mapa de los ids posicionales de antes de los ids estables a los ids actuales,
+    para redirigir los enlaces /noticias/<n> ya publicados (astro.config.mjs).
+    Se crea una sola vez con el orden vigente al migrar; después solo se
+    retiran las noticias eliminadas
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            legacy = json.load(f)
+    except OSError:
+        legacy = {str(position): noticia_id for position, noticia_id in enumerate(ids, 1)}
+    current = set(ids)
+    return _write_if_changed(filepath, {old: new for old, new in legacy.items() if new in current})
+
+
+def summarize(noticia_id: str, noticia: Dict[str, Any]) -> Dict[str, Any]:
+    """Campos que usan las tarjetas de los listados"""
+    texto = noticia['texto']
+    return {
+        'id': noticia_id,
+        'fecha': noticia.get('fecha', ''),
+        'titulo': make_title(texto),
+        'extracto': make_excerpt(texto),
+        'categoria': infer_category(texto),
+        'imagen': noticia.get('imagen', ''),
+        'imagen_placeholder': noticia.get('imagen_placeholder', ''),
+    }
+
+
+def _write_if_changed(filepath: str, value: Any, compact: bool = False) -> bool:
+    """Escribe el JSON solo si su contenido cambió (evita reescribir cientos de archivos iguales)"""
+    if compact:
+        text = json.dumps(value, ensure_ascii=False, separators=(',', ':')) + '\n'
+    else:
+        text = json.dumps(value, ensure_ascii=False, indent=2) + '\n'
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    with atomic_write(filepath) as f:
+        f.write(text)
+    return True
+
+
+def _remove_stale(directory: str, keep: Iterable[str]) -> int:
+    """Elimina los .json de `directory` que ya no corresponden a ninguna noticia o página"""
+    keep = set(keep)
+    removed = 0
+    for name in os.listdir(directory):
+        if name.endswith('.json') and name not in keep:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+    return removed
+
+
+def write_shards(noticias: Iterable[Dict[str, Any]], output_dir: str,
+                 page_size: int = NEWS_SHARDS['page_size'],
+                 latest_n: int = NEWS_SHARDS['latest_n'],
+                 source: Optional[str] = None,
+                 images: Optional[ImagePipeline] = None) -> Dict[str, Any]:
+    """
+    Genera manifest, latest, páginas y archivos por noticia en `output_dir`
+
+    Args:
+        noticias: Noticias en el orden de cms2.json (más recientes primero)
+        output_dir (str): Directorio de salida (se crean pages/ e items/)
+        page_size (int): Noticias por página del listado
+        latest_n (int): Noticias de latest.json
+        source (str): Archivo de origen que se anota en el manifest
+        images (ImagePipeline): Si se indica, `imagen` apunta a la miniatura local
+
+    Returns:
+        dict: El manifest escrito, con la cantidad de archivos reescritos en 'written'
+            y los cambios respecto de la exportación anterior en 'changes'
+    """
+    pages_dir = os.path.join(output_dir, 'pages')
+    items_dir = os.path.join(output_dir, 'items')
+    os.makedirs(pages_dir, exist_ok=True)
+    os.makedirs(items_dir, exist_ok=True)
+
+    # Mismo filtro que las páginas: las entradas sin texto no se publican
+    published = [n for n in noticias if n.get('texto') and n['texto'].strip()]
+    localized = images.localize(published, 'imagen') if images else 0
+    summaries: List[Dict[str, Any]] = []
+    years: Counter = Counter()
+    index: Dict[str, Dict[str, Any]] = {}
+    written = 0
+
+    for position, (noticia_id, noticia) in enumerate(zip(assign_ids(published), published)):
+        summary = summarize(noticia_id, noticia)
+        summaries.append(summary)
+        years[extract_year(summary['fecha'])] += 1
+        item = {**summary, 'texto': noticia['texto'], 'link': noticia.get('link', '')}
+        del item['extracto']
+        index[noticia_id] = {'page': position // page_size + 1, 'hash': item_hash(item)}
+        written += _write_if_changed(os.path.join(items_dir, f"{noticia_id}.json"), item)
+
+    pages = []
+    changed_pages = []
+    for start in range(0, len(summaries), page_size):
+        page_number = start // page_size + 1
+        chunk = summaries[start:start + page_size]
+        pages.append({'page': page_number, 'count': len(chunk),
+                      'first_id': chunk[0]['id'], 'last_id': chunk[-1]['id']})
+        if _write_if_changed(os.path.join(pages_dir, f"{page_number}.json"), chunk):
+            written += 1
+            changed_pages.append(page_number)
+
+    # Cambios por id respecto del índice anterior: lo que el build o la CDN deben regenerar
+    index_path = os.path.join(output_dir, NEWS_SHARDS['index_file'])
+    previous = load_index(index_path)
+    added = [i for i in index if i not in previous]
+    updated = [i for i in index if i in previous and previous[i].get('hash') != index[i]['hash']]
+    changes = {
+        'added': added,
+        'updated': updated,
+        'removed': [i for i in previous if i not in index],
+        'changed': added + updated,
+        'pages': changed_pages,
+    }
+    written += _write_if_changed(index_path, index)
+    written += _write_if_changed(os.path.join(output_dir, NEWS_SHARDS['changes_file']), changes)
+
+    written += update_legacy_ids(os.path.join(output_dir, NEWS_SHARDS['legacy_file']), list(index))
+    written += _write_if_changed(os.path.join(output_dir, 'latest.json'), summaries[:latest_n])
+
+    removed = _remove_stale(items_dir, (f"{s['id']}.json" for s in summaries))
+    removed += _remove_stale(pages_dir, (f"{p['page']}.json" for p in pages))
+
+    manifest = {
+        'source': source,
+        'total': len(summaries),
+        'page_size': page_size,
+        'latest_n': min(latest_n, len(summaries)),
+        'ids': [s['id'] for s in summaries],
+        'pages': pages,
+        'years': {year: years[year] for year in sorted(years, reverse=True)},
+        'images': localized,
+    }
+    written += _write_if_changed(os.path.join(output_dir, 'manifest.json'), manifest, compact=True)
+    logger.info(f"Fragmentos CMS: {len(summaries)} noticias en {len(pages)} páginas "
+                f"({written} archivos escritos, {removed} eliminados; "
+                f"{len(changes['changed'])} ids cambiados, {len(changes['removed'])} retirados)")
+    return {**manifest, 'written': written, 'removed': removed, 'changes': changes}
+
+
+def export_cms_shards(data_dir: str = DATA_DIR, source_file: str = 'cms2.json',
+                      output_dir: Optional[str] = None, images: Optional[ImagePipeline] = None,
+                      **kwargs) -> Dict[str, Any]:
+    """
+    Genera los fragmentos a partir del cms2.json publicado en `data_dir`; las
+    imágenes solo se localizan si se pasa `images` (quien lo crea guarda su manifest)
+    """
+    with open(os.path.join(data_dir, source_file), 'r', encoding='utf-8-sig') as f:
+        noticias = json.load(f).get('noticias', [])
+    output_dir = output_dir or os.path.join(data_dir, NEWS_SHARDS['output_dir'])
+    return write_shards(noticias, output_dir, source=source_file, images=images, **kwargs)
+
+
+def main():
+    """Genera los fragmentos de cms2.json para el build de Astro"""
+    parser = argparse.ArgumentParser(description="Fragmenta cms2.json para las páginas Astro")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directorio de los JSON del sitio")
+    parser.add_argument('--page-size', type=int, default=NEWS_SHARDS['page_size'], help="Noticias por página")
+    parser.add_argument('--latest', type=int, default=NEWS_SHARDS['latest_n'], help="Noticias de latest.json")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    manifest = export_cms_shards(args.data_dir, page_size=args.page_size, latest_n=args.latest)
+    print(f"🧩 {manifest['total']} noticias → {len(manifest['pages'])} páginas, "
+          f"{manifest['written']} archivos escritos, {manifest['removed']} eliminados, "
+          f"{len(manifest['changes']['changed'])} ids para regenerar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Planificador de consultas para NewsAPI
+Agrupa los términos de búsqueda en el mínimo de consultas booleanas
+("(ISO 9001) OR (ISO 14001) ...") que caben en el largo máximo de `q`, y
+permite atribuir cada resultado a los términos que lo originaron
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+from urllib.parse import quote_plus
+
+from config_iso_scraper import QUERY_PLANNER
+from keyword_matcher import fold
+
+WORD_RE = re.compile(r'\w+')
+
+
+def term_words(term: str) -> frozenset:
+    """Palabras normalizadas de un término (NewsAPI exige todas: AND implícito)"""
+    return frozenset(WORD_RE.findall(fold(term)))
+
+
+class PlannedQuery(NamedTuple):
+    query: str
+    terms: Tuple[str, ...]
+    days_back: int
+    chilean_only: bool
+
+
+class QueryPlanner:
+    def __init__(self, max_length: int = QUERY_PLANNER['max_query_length'],
+                 chile_terms: Iterable[str] = QUERY_PLANNER['chile_terms']):
+        """
+        Args:
+            max_length (int): Largo máximo de `q` una vez codificado en la URL
+            chile_terms (list): Variantes que restringen una consulta a Chile
+                (reemplazan las consultas "{q} Chile", "Chile {q}", "{q} chileno"...)
+        """
+        self.max_length = max_length
+        self.chile_terms = list(chile_terms)
+        self.chile_clause = ' OR '.join(self.chile_terms)
+
+    @staticmethod
+    def minimal_terms(terms: Iterable[str]) -> List[str]:
+        """
+        Descarta términos redundantes dentro de un OR: si todas las palabras de
+        otro término están contenidas en este, el otro ya cubre sus resultados
+        """
+        unique = list(dict.fromkeys(t.strip() for t in terms if t and t.strip()))
+        words = {term: term_words(term) for term in unique}
+        return [
+            term for i, term in enumerate(unique)
+            if not any(
+                words[other] < words[term] or (words[other] == words[term] and j < i)
+                for j, other in enumerate(unique) if j != i
+            )
+        ]
+
+    def fits(self, query: str) -> bool:
+        return len(quote_plus(query)) <= self.max_length
+
+    def render(self, terms: List[str], chilean_only: bool) -> str:
+        terms_clause = ' OR '.join(f"({term})" if ' ' in term else term for term in terms)
+        if chilean_only:
+            return f"({terms_clause}) AND ({self.chile_clause})"
+        return terms_clause
+
+    def batch(self, terms: Iterable[str], days_back: int, chilean_only: bool) -> List[PlannedQuery]:
+        """
+        Empaqueta los términos en orden en la menor cantidad de consultas que respeten el largo máximo
+        """
+        planned = []
+        current: List[str] = []
+        for term in self.minimal_terms(terms):
+            if current and not self.fits(self.render(current + [term], chilean_only)):
+                planned.append(PlannedQuery(self.render(current, chilean_only), tuple(current), days_back, chilean_only))
+                current = []
+            current.append(term)
+        if current:
+            planned.append(PlannedQuery(self.render(current, chilean_only), tuple(current), days_back, chilean_only))
+        return planned
+
+    def plan(self, terms: Iterable[str], days_back: int = 30,
+             chilean_days_back: int = 60) -> List[PlannedQuery]:
+        """
+        Consultas generales (últimos `days_back` días) y consultas restringidas a
+        Chile (últimos `chilean_days_back` días) para todos los términos
+        """
+        terms = list(terms)
+        return self.batch(terms, days_back, False) + self.batch(terms, chilean_days_back, True)
+
+    @staticmethod
+    def matching_terms(planned: PlannedQuery, article: Dict[str, Any]) -> List[str]:
+        """
+        Términos de la consulta cuyas palabras aparecen todas en el artículo
+        Si ninguno se puede verificar (contenido truncado por la API) se atribuye
+        a todos los términos de la consulta
+        """
+        text = ' '.join(article.get(field) or '' for field in ('title', 'description', 'content'))
+        words = set(WORD_RE.findall(fold(text)))
+        matched = [term for term in planned.terms if term_words(term) <= words]
+        return matched or list(planned.terms)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Limitador de tasa (token bucket) compartido entre hilos para los scrapers ISO
+Reemplaza las pausas fijas (time.sleep) por una tasa global de requests
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Inicializa el bucket
+
+        Args:
+            rate (float): Tokens repuestos por segundo (requests/segundo permitidos)
+            capacity (float): Ráfaga máxima; por defecto igual a la tasa (mínimo 1)
+        """
+        if rate <= 0:
+            raise ValueError("La tasa del token bucket debe ser positiva")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Intenta consumir tokens sin bloquear
+
+        Returns:
+            float: 0 si se consumieron, o los segundos a esperar para tenerlos
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Bloquea hasta poder consumir tokens
+
+        Returns:
+            float: Segundos totales esperados
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class HostRateLimiter:
+    def __init__(self, rates: Optional[Dict[str, float]] = None, default_rate: float = 1.0):
+        """
+        Mantiene un token bucket independiente por host, más una ventana de
+        bloqueo por host cuando el servidor pide esperar (Retry-After)
+
+        Args:
+            rates (dict): Requests/segundo por host (ej: {'newsapi.org': 2})
+            default_rate (float): Tasa para hosts no configurados
+        """
+        self.rates = {normalize_host(host): rate for host, rate in (rates or {}).items()}
+        self.default_rate = default_rate
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, host: str) -> TokenBucket:
+        host = normalize_host(host)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rates.get(host, self.default_rate))
+                self._buckets[host] = bucket
+            return bucket
+
+    def block(self, host: str, seconds: float) -> None:
+        """
+        Suspende todos los requests a un host durante `seconds`
+        """
+        host = normalize_host(host)
+        until = time.monotonic() + max(0.0, seconds)
+        with self._lock:
+            if until > self._blocked_until.get(host, 0.0):
+                self._blocked_until[host] = until
+
+    def acquire(self, host: str) -> float:
+        """
+        Espera el turno del host (bloqueo por Retry-After + token bucket)
+
+        Returns:
+            float: Segundos totales esperados
+        """
+        host = normalize_host(host)
+        waited = 0.0
+        with self._lock:
+            blocked_until = self._blocked_until.get(host, 0.0)
+        pause = blocked_until - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+            waited += pause
+        return waited + self.bucket_for(host).acquire()
+
+
+def normalize_host(host: str) -> str:
+    """Normaliza un host para agrupar budgets (sin 'www.' ni puerto)"""
+    host = (host or '').lower().split(':', 1)[0]
+    return host[4:] if host.startswith('www.') else host
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Métricas estructuradas de una ejecución de los scrapers ISO
+Registra tiempo por etapa, requests/latencia/bytes/caché por host y artículos
+que entran y salen de cada filtro. Se escriben como reporte JSON junto a
+iso_news.json y, opcionalmente, en formato de texto de Prometheus
+"""
+
+import functools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from json_writer import atomic_write, write_json
+
+# Límites superiores (segundos) del histograma de latencia por host
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_PREFIX = 'iso_scraper'
+
+
+class RunMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta lo registrado (inicio de una nueva ejecución)"""
+        with self._lock:
+            self.started_at = datetime.now()
+            self._start = time.monotonic()
+            # etapa -> calls, seconds (suma entre hilos), first_start, last_end
+            self.stages: Dict[str, Dict[str, float]] = {}
+            self.hosts: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+            # host -> conteo por bucket (el último es +Inf), suma y cantidad
+            self.latency: Dict[str, Dict[str, Any]] = {}
+            self.filters: Dict[str, Dict[str, int]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Mide el tiempo de un bloque como parte de la etapa `name`"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            end = time.monotonic()
+            with self._lock:
+                entry = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'first_start': start, 'last_end': end})
+                entry['calls'] += 1
+                entry['seconds'] += end - start
+                entry['first_start'] = min(entry['first_start'], start)
+                entry['last_end'] = max(entry['last_end'], end)
+
+    def timed(self, name: str) -> Callable:
+        """Decorador: cada llamada a la función cuenta en la etapa `name`"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count_host(self, host: str, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self.hosts[host][key] += amount
+
+    def observe_request(self, host: str, seconds: float, size: int) -> None:
+        """Latencia y bytes descargados de un request a `host`"""
+        with self._lock:
+            histogram = self.latency.setdefault(host, {'buckets': [0] * (len(LATENCY_BUCKETS) + 1), 'sum': 0.0, 'count': 0})
+            index = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+            histogram['buckets'][index] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+            self.hosts[host]['bytes'] += size
+
+    def record_filter(self, name: str, count_in: int, count_out: int) -> None:
+        """Artículos que entran y salen de un filtro (se acumula entre llamadas)"""
+        with self._lock:
+            entry = self.filters.setdefault(name, {'in': 0, 'out': 0})
+            entry['in'] += count_in
+            entry['out'] += count_out
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'started_at': self.started_at.isoformat(),
+                'finished_at': datetime.now().isoformat(),
+                'wall_seconds': round(time.monotonic() - self._start, 3),
+                'stages': {
+                    name: {
+                        'calls': int(s['calls']),
+                        'seconds': round(s['seconds'], 4),
+                        'wall_seconds': round(s['last_end'] - s['first_start'], 4),
+                    }
+                    for name, s in self.stages.items()
+                },
+                'hosts': {
+                    host: {
+                        **{key: round(value, 4) for key, value in counters.items()},
+                        'latency': self._latency_summary(host),
+                    }
+                    for host, counters in self.hosts.items()
+                },
+                'filters': {
+                    name: {**f, 'dropped': f['in'] - f['out']} for name, f in self.filters.items()
+                },
+            }
+
+    def _latency_summary(self, host: str) -> Optional[Dict[str, Any]]:
+        histogram = self.latency.get(host)
+        if not histogram:
+            return None
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ['+Inf']
+        return {
+            'count': histogram['count'],
+            'sum_seconds': round(histogram['sum'], 4),
+            'buckets': dict(zip(bounds, histogram['buckets'])),
+        }
+
+    def to_prometheus(self) -> str:
+        """Reporte en formato de exposición de texto de Prometheus"""
+        report = self.report()
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+            full = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{full}{suffix}{{{label_text}}} {value}")
+
+        stages = report['stages']
+        metric('stage_seconds_total', 'counter', 'Tiempo acumulado por etapa',
+               [('', {'stage': n}, s['seconds']) for n, s in stages.items()])
+        metric('stage_wall_seconds', 'gauge', 'Tiempo de reloj entre el primer inicio y el último fin de la etapa',
+               [('', {'stage': n}, s['wall_seconds']) for n, s in stages.items()])
+        metric('stage_calls_total', 'counter', 'Invocaciones por etapa',
+               [('', {'stage': n}, s['calls']) for n, s in stages.items()])
+
+        counter_keys = sorted({key for h in report['hosts'].values() for key in h if key != 'latency'})
+        for key in counter_keys:
+            metric(f"http_{key}_total", 'counter', f"Contador HTTP {key} por host",
+                   [('', {'host': host}, h.get(key, 0)) for host, h in report['hosts'].items()])
+
+        samples = []
+        for host, h in report['hosts'].items():
+            latency = h['latency']
+            if not latency:
+                continue
+            cumulative = 0
+            for bound, count in latency['buckets'].items():
+                cumulative += count
+                samples.append(('_bucket', {'host': host, 'le': bound}, cumulative))
+            samples.append(('_sum', {'host': host}, latency['sum_seconds']))
+            samples.append(('_count', {'host': host}, latency['count']))
+        metric('http_request_duration_seconds', 'histogram', 'Latencia de requests por host', samples)
+
+        metric('filter_articles_total', 'counter', 'Artículos que entran y salen de cada filtro',
+               [('', {'filter': n, 'direction': d}, f[d]) for n, f in report['filters'].items() for d in ('in', 'out')])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, report_path: str, prometheus_path: Optional[str] = None) -> None:
+        """Escribe el reporte JSON (y el de Prometheus si se indica) de forma atómica"""
+        write_json(report_path, self.report(), compact=False)
+        if prometheus_path:
+            with atomic_write(prometheus_path) as f:
+                f.write(self.to_prometheus())
+
+
+# Instancia compartida por todos los scrapers de una ejecución
+METRICS = RunMetrics()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Estado persistente entre ejecuciones para scraping incremental
+Guarda el último publishedAt por consulta (high-water mark), el rendimiento
+histórico de cada consulta y un índice de URLs y hashes de contenido ya procesados
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from config_iso_scraper import HTTP_CACHE, INCREMENTAL, PAGINATION
+
+
+def content_hash(article: Dict[str, Any]) -> str:
+    """
+    Hash estable del contenido (título + descripción normalizados)
+    Detecta el mismo artículo publicado bajo URLs distintas
+    """
+    title = ' '.join((article.get('title') or '').lower().split())
+    description = ' '.join((article.get('description') or article.get('summary') or '').lower().split())
+    return hashlib.sha1(f"{title}\n{description}".encode('utf-8')).hexdigest()
+
+
+class ScrapeState:
+    def __init__(self, path: str, max_seen: int = INCREMENTAL['max_seen_urls']):
+        """
+        Carga el estado desde `path` (si no existe se parte vacío)
+
+        Args:
+            path (str): Archivo JSON del estado
+            max_seen (int): Máximo de URLs recordadas (se descartan las más antiguas)
+        """
+        self.path = path
+        self.max_seen = max_seen
+        self._lock = threading.Lock()
+
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+
+        self.high_water: Dict[str, str] = data.get('high_water', {})
+        # consulta -> artículos nuevos por request (promedio móvil exponencial)
+        self.yields: Dict[str, float] = data.get('yields', {})
+        # url -> hash de contenido; el orden de inserción permite descartar los más antiguos
+        self.seen: Dict[str, str] = data.get('seen', {})
+        self.seen_hashes = set(self.seen.values())
+
+    def since(self, key: str) -> Optional[str]:
+        """Último publishedAt conocido para una consulta/fuente"""
+        with self._lock:
+            return self.high_water.get(key)
+
+    def update_high_water(self, key: str, articles: Iterable[Dict[str, Any]]) -> None:
+        """
+        Avanza el high-water mark con el publishedAt más reciente de `articles`
+        """
+        latest = max((a.get('publishedAt') or '' for a in articles), default='')
+        if not latest:
+            return
+        with self._lock:
+            if latest > self.high_water.get(key, ''):
+                self.high_water[key] = latest
+
+    def query_yield(self, key: str, default: float = PAGINATION['default_yield']) -> float:
+        """Artículos nuevos por request que entregó la consulta históricamente"""
+        with self._lock:
+            return self.yields.get(key, default)
+
+    def record_yield(self, key: str, new_count: int, requests: int,
+                     smoothing: float = PAGINATION['yield_smoothing']) -> None:
+        """
+        Actualiza el rendimiento de una consulta con el resultado de esta ejecución
+        """
+        if requests <= 0:
+            return
+        observed = new_count / requests
+        with self._lock:
+            previous = self.yields.get(key)
+            self.yields[key] = observed if previous is None else (
+                smoothing * observed + (1 - smoothing) * previous
+            )
+
+    def is_new(self, article: Dict[str, Any]) -> bool:
+        url = article.get('url')
+        with self._lock:
+            return url not in self.seen and content_hash(article) not in self.seen_hashes
+
+    def filter_new(self, articles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [a for a in articles if self.is_new(a)]
+
+    def mark_seen(self, articles: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            for article in articles:
+                url = article.get('url')
+                if not url:
+                    continue
+                digest = content_hash(article)
+                self.seen.pop(url, None)
+                self.seen[url] = digest
+                self.seen_hashes.add(digest)
+
+            overflow = len(self.seen) - self.max_seen
+            if overflow > 0:
+                for url in list(self.seen)[:overflow]:
+                    del self.seen[url]
+                self.seen_hashes = set(self.seen.values())
+
+    def save(self) -> None:
+        """
+        Persiste el estado (escritura a archivo temporal + reemplazo)
+        """
+        with self._lock:
+            data = {
+                'updated_at': datetime.now().isoformat(),
+                'high_water': self.high_water,
+                'yields': self.yields,
+                'seen': self.seen,
+            }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def default_state_path() -> str:
+    """
+    El estado vive junto a la caché HTTP para restaurarse con ella en CI
+    """
+    directory = os.getenv('SCRAPER_CACHE_DIR', HTTP_CACHE['directory'])
+    return os.path.join(directory, INCREMENTAL['state_file'])
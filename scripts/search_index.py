@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Índice invertido precalculado para la búsqueda de noticias del sitio
+Indexa las noticias de cms2.json (con los ids estables de news_shards.py) y
+los artículos de iso_news.json. Los términos se normalizan sin tildes ni
+mayúsculas, se descartan palabras vacías y se reducen con un stemmer liviano
+de español; NewsSearch.astro aplica la misma normalización en el navegador
+con las reglas (palabras vacías y sufijos) que publica el manifest.
+
+Se publica en public/search/ para que el navegador descargue solo lo que
+necesita una consulta:
+
+    manifest.json                 Parámetros y nombre de cada fragmento
+    terms/<prefijo>.<hash>.json   Términos que empiezan con <prefijo>: término -> postings
+    docs/<bloque>.<hash>.json     Título, URL, fecha y fuente de cada documento
+
+Los postings son los números de documento en orden creciente codificados
+como diferencias ([3, 10, 12] -> [3, 7, 2]). Los documentos se numeran de
+más reciente a más antiguo, de modo que un número menor es más reciente.
+Los nombres llevan el hash del contenido para poder cachearlos sin expirar
+
+Uso:
+    python search_index.py
+    python search_index.py --data-dir ../src/data --output-dir ../public/search
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from config_iso_scraper import SEARCH_INDEX
+from date_normalizer import normalize_date, to_display
+from json_writer import atomic_write
+from keyword_matcher import fold
+from news_shards import assign_ids, make_title, stable_id
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+DATA_DIR = os.path.join(ROOT_DIR, 'src', 'data')
+OUTPUT_DIR = os.path.join(ROOT_DIR, 'public', SEARCH_INDEX['output_dir'])
+
+# Letras y dígitos (sin "_"), igual que /[\p{L}\p{N}]+/gu en el navegador
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+STOPWORDS = frozenset('''
+a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante e el ella
+ellas ellos en entre era es esa esas ese eso esos esta estas este esto estos fue fueron ha han hasta hay
+la las le les lo los mas me mi mientras muy nos o otra otras otro otros para pero por porque que quien
+se sea ser si sin sino sobre son su sus tambien te tiene tienen todo todos tu un una unas uno unos y ya
+and are for from in is of on or that the to with
+'''.split())
+
+# Sufijos derivativos, los más largos primero (solo se quita el primero que aplica)
+SUFFIXES = (
+    'amientos', 'imientos', 'aciones', 'iciones', 'uciones', 'amiento', 'imiento',
+    'adoras', 'adores', 'ancias', 'encias', 'idades', 'mente', 'acion', 'icion', 'ucion',
+    'adora', 'ador', 'ancia', 'encia', 'idad', 'ables', 'ibles', 'istas', 'ismos',
+    'able', 'ible', 'ista', 'ismo', 'osos', 'osas', 'ivos', 'ivas', 'oso', 'osa', 'ivo', 'iva',
+)
+MIN_STEM = 3
+
+
+def stem(token: str) -> str:
+    """
+    Stemmer liviano de español: un sufijo derivativo, o plural y vocal final
+    ("certificaciones" -> "certific", "normas" -> "norm"); los números no cambian
+    """
+    if not token.isalpha():
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            return token[:-len(suffix)]
+    if token.endswith('es') and len(token) > 4:
+        token = token[:-2]
+    elif token.endswith('s') and len(token) > 3:
+        token = token[:-1]
+    if token[-1] in 'aeo' and len(token) > MIN_STEM:
+        token = token[:-1]
+    return token
+
+
+def analyze(text: str) -> List[str]:
+    """Texto -> términos indexables (sin tildes, sin palabras vacías, con stemming)"""
+    return [
+        stem(token) for token in TOKEN_RE.findall(fold(text))
+        if len(token) >= SEARCH_INDEX['min_token_length'] and token not in STOPWORDS
+    ]
+
+
+def cms_documents(data_dir: str) -> List[Dict[str, Any]]:
+    """Noticias de cms2.json, con los mismos ids y títulos que las páginas /noticias/<id>"""
+    with open(os.path.join(data_dir, 'cms2.json'), 'r', encoding='utf-8-sig') as f:
+        noticias = [n for n in json.load(f).get('noticias', []) if n.get('texto') and n['texto'].strip()]
+    return [
+        {
+            'id': noticia_id,
+            'title': make_title(noticia['texto']),
+            'url': f"/noticias/{noticia_id}",
+            'date': noticia.get('fecha', ''),
+            'published_at': normalize_date(noticia.get('fecha')),
+            'source': 'CMS Consultores',
+            'text': noticia['texto'],
+        }
+        for noticia_id, noticia in zip(assign_ids(noticias), noticias)
+    ]
+
+
+def iso_news_documents(data_dir: str) -> List[Dict[str, Any]]:
+    """Artículos publicados en iso_news.json (enlazan al medio original; id = hash de la URL)"""
+    try:
+        with open(os.path.join(data_dir, 'iso_news.json'), 'r', encoding='utf-8') as f:
+            articles = json.load(f).get('articles', [])
+    except (OSError, ValueError):
+        return []
+    return [
+        {
+            'id': stable_id({'link': article['url']}),
+            'title': article.get('title') or '',
+            'url': article.get('url') or '',
+            'date': to_display(article.get('published_at')),
+            'published_at': article.get('published_at'),
+            'source': article.get('source') or '',
+            'text': f"{article.get('summary') or ''} {article.get('full_content') or ''}",
+        }
+        for article in articles if article.get('url')
+    ]
+
+
+def build_index(documents: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Numera los documentos (más recientes primero; sin fecha al final) y arma
+    el índice término -> números de documento
+    """
+    documents = sorted(documents, key=lambda d: d.get('published_at') or '', reverse=True)
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for number, document in enumerate(documents):
+        for term in dict.fromkeys(analyze(f"{document['title']} {document['text']}")):
+            postings[term].append(number)
+    return {'documents': documents, 'postings': postings}
+
+
+def delta_encode(numbers: List[int]) -> List[int]:
+    """[3, 10, 12] -> [3, 7, 2] (los números vienen ordenados de menor a mayor)"""
+    return [number - previous for previous, number in zip([0] + numbers, numbers)]
+
+
+def _content_name(prefix: str, value: Any) -> Tuple[str, str]:
+    """Nombre de archivo con el hash del contenido, y el JSON compacto a escribir"""
+    text = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return f"{prefix}.{hashlib.sha256(text.encode('utf-8')).hexdigest()[:10]}.json", text
+
+
+def write_index(index: Dict[str, Any], output_dir: str,
+                prefix_length: int = SEARCH_INDEX['prefix_length'],
+                block_size: int = SEARCH_INDEX['doc_block_size']) -> Dict[str, Any]:
+    """
+    Escribe fragmentos de términos y documentos, y el manifest que los enumera
+
+    Returns:
+        dict: El manifest escrito, con los archivos escritos y eliminados
+    """
+    shards: Dict[str, Dict[str, List[int]]] = defaultdict(dict)
+    for term in sorted(index['postings']):
+        shards[term[:prefix_length]][term] = delta_encode(index['postings'][term])
+    documents = [
+        {key: document[key] for key in ('title', 'url', 'date', 'source')}
+        for document in index['documents']
+    ]
+
+    manifest = {
+        'version': 1,
+        'prefix_length': prefix_length,
+        'min_token_length': SEARCH_INDEX['min_token_length'],
+        'doc_count': len(documents),
+        'doc_block_size': block_size,
+        # Reglas de analyze(): el navegador las lee de aquí para normalizar la consulta igual
+        'stopwords': sorted(STOPWORDS),
+        'suffixes': list(SUFFIXES),
+        'min_stem': MIN_STEM,
+        'terms': {},
+        'docs': [],
+    }
+    # Subdirectorio -> nombre de archivo -> contenido
+    outputs: Dict[str, Dict[str, str]] = {'terms': {}, 'docs': {}}
+    for prefix in sorted(shards):
+        name, text = _content_name(prefix, shards[prefix])
+        outputs['terms'][name] = text
+        manifest['terms'][prefix] = name
+    for block, start in enumerate(range(0, len(documents), block_size)):
+        name, text = _content_name(str(block), documents[start:start + block_size])
+        outputs['docs'][name] = text
+        manifest['docs'].append(name)
+
+    written = removed = 0
+    for subdir, contents in outputs.items():
+        directory = os.path.join(output_dir, subdir)
+        os.makedirs(directory, exist_ok=True)
+        for name, text in contents.items():
+            # El nombre lleva el hash del contenido: si el archivo existe, es idéntico
+            if not os.path.exists(os.path.join(directory, name)):
+                with atomic_write(os.path.join(directory, name)) as f:
+                    f.write(text)
+                written += 1
+        for name in os.listdir(directory):
+            if name.endswith('.json') and name not in contents:
+                os.remove(os.path.join(directory, name))
+                removed += 1
+
+    with atomic_write(os.path.join(output_dir, 'manifest.json')) as f:
+        f.write(json.dumps(manifest, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    logger.info(f"Índice de búsqueda: {len(documents)} documentos, {len(index['postings'])} términos "
+                f"en {len(shards)} fragmentos ({written} archivos escritos, {removed} eliminados)")
+    return {**manifest, 'written': written, 'removed': removed}
+
+
+def export_search_index(data_dir: str = DATA_DIR, output_dir: str = OUTPUT_DIR) -> Dict[str, Any]:
+    """Reconstruye el índice desde los JSON publicados en `data_dir`"""
+    documents = cms_documents(data_dir) + iso_news_documents(data_dir)
+    return write_index(build_index(documents), output_dir)
+
+
+def main():
+    """Genera el índice de búsqueda en public/search"""
+    parser = argparse.ArgumentParser(description="Índice de búsqueda de noticias para el sitio")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directorio de los JSON del sitio")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR, help="Directorio publicado del índice")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    manifest = export_search_index(args.data_dir, args.output_dir)
+    print(f"🔎 {manifest['doc_count']} documentos → {len(manifest['terms'])} fragmentos de términos, "
+          f"{len(manifest['docs'])} bloques de documentos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Facetas por norma ISO precalculadas al exportar
+Recorre una vez las noticias de cms2.json y los artículos de iso_news.json,
+etiqueta cada uno con las normas y versiones que menciona ("ISO 9001:2015",
+"ISO 14.001-2015", "ISO 9001, 14001 y 45001") y publica en src/data/standards/:
+
+    index.json        norma -> archivo, artículos y conteo por versión
+    iso-<n>.json      Artículos de una norma (más recientes primero)
+
+Cada página de norma (iso-9001.astro, iso-14001.astro...) carga solo su
+archivo a través de StandardNews.astro
+
+Uso:
+    python standard_facets.py
+"""
+
+import argparse
+import logging
+import os
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List
+
+from article_stats import KNOWN_STANDARDS, standard_mentions
+from config_iso_scraper import STANDARD_FACETS
+from json_writer import write_json
+from search_index import DATA_DIR, cms_documents, iso_news_documents
+
+logger = logging.getLogger(__name__)
+
+# Normas que el sitio sigue (tienen página o palabra clave): siempre tienen archivo
+TRACKED_STANDARDS = sorted(KNOWN_STANDARDS)
+UNVERSIONED = 'sin_version'
+
+
+def facet_filename(standard: str) -> str:
+    """"ISO 9001" -> "iso-9001.json" """
+    return standard.lower().replace(' ', '-') + '.json'
+
+
+def build_facets(documents: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Etiqueta cada documento en una pasada y agrupa por norma
+
+    Returns:
+        dict: norma -> {'articles': [...], 'versions': Counter}
+    """
+    facets: Dict[str, Dict[str, Any]] = defaultdict(lambda: {'articles': [], 'versions': Counter()})
+    documents = sorted(documents, key=lambda d: d.get('published_at') or '', reverse=True)
+    for document in documents:
+        versions: Dict[str, set] = defaultdict(set)
+        for standard, version in standard_mentions(f"{document['title']} {document['text']}"):
+            versions[standard].add(version or UNVERSIONED)
+        for standard, found in versions.items():
+            # Una versión explícita reemplaza a las menciones sin versión del mismo artículo
+            explicit = sorted(found - {UNVERSIONED})
+            facet = facets[standard]
+            facet['versions'].update(explicit or [UNVERSIONED])
+            facet['articles'].append({
+                'id': document['id'],
+                'title': document['title'],
+                'url': document['url'],
+                'date': document['date'],
+                'source': document['source'],
+                'versions': explicit,
+            })
+    return facets
+
+
+def write_facets(facets: Dict[str, Dict[str, Any]], output_dir: str,
+                 min_articles: int = STANDARD_FACETS['min_articles']) -> Dict[str, Any]:
+    """
+    Escribe un archivo por norma y el índice
+
+    Returns:
+        dict: El índice escrito
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    published = [
+        standard for standard in facets
+        if standard in TRACKED_STANDARDS or len(facets[standard]['articles']) >= min_articles
+    ]
+    published += [standard for standard in TRACKED_STANDARDS if standard not in facets]
+
+    index: Dict[str, Any] = {}
+    for standard in sorted(published, key=lambda s: (-len(facets.get(s, {}).get('articles', [])), s)):
+        facet = facets.get(standard, {'articles': [], 'versions': Counter()})
+        versions = dict(facet['versions'].most_common())
+        write_json(os.path.join(output_dir, facet_filename(standard)), {
+            'standard': standard,
+            'count': len(facet['articles']),
+            'versions': versions,
+            'articles': facet['articles'],
+        }, compact=False)
+        index[standard] = {'file': facet_filename(standard), 'count': len(facet['articles']),
+                           'versions': versions}
+    write_json(os.path.join(output_dir, 'index.json'), index, compact=False)
+
+    keep = {entry['file'] for entry in index.values()} | {'index.json'}
+    for name in os.listdir(output_dir):
+        if name.endswith('.json') and name not in keep:
+            os.remove(os.path.join(output_dir, name))
+
+    tagged = sum(1 for entry in index.values() if entry['count'])
+    logger.info(f"Facetas ISO: {len(index)} normas publicadas ({tagged} con artículos)")
+    return index
+
+
+def export_standard_facets(data_dir: str = DATA_DIR) -> Dict[str, Any]:
+    """Reconstruye las facetas desde los JSON publicados en `data_dir`"""
+    documents: List[Dict[str, Any]] = cms_documents(data_dir) + iso_news_documents(data_dir)
+    return write_facets(build_facets(documents), os.path.join(data_dir, STANDARD_FACETS['output_dir']))
+
+
+def main():
+    """Genera las facetas por norma en src/data/standards"""
+    parser = argparse.ArgumentParser(description="Facetas de noticias por norma ISO")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directorio de los JSON del sitio")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    index = export_standard_facets(args.data_dir)
+    for standard, entry in index.items():
+        print(f"🏷️ {standard}: {entry['count']} artículos {entry['versions'] or ''}")
+
+
+if __name__ == "__main__":
+    main()